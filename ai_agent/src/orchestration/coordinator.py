@@ -1,5 +1,5 @@
 import traceback
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 from ai_agent.src.agents.base.enums import AgentTaskType
@@ -127,4 +127,14 @@ class Coordinator:
         """Get the status of a workflow."""
         if workflow_id not in self.active_workflows:
             return {"status": "not_found"}
-        return self.active_workflows[workflow_id]
\ No newline at end of file
+        return self.active_workflows[workflow_id]
+
+
+_coordinator: Optional[Coordinator] = None
+
+def get_coordinator() -> Coordinator:
+    """Return the process-wide Coordinator, creating it on first use."""
+    global _coordinator
+    if _coordinator is None:
+        _coordinator = Coordinator()
+    return _coordinator
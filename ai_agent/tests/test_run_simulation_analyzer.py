@@ -0,0 +1,55 @@
+import importlib.util
+import pytest
+import sys
+import os
+
+# Add repository root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# The analyzer exits at import time without a Groq client library
+if importlib.util.find_spec("groq") is None and importlib.util.find_spec("langchain_groq") is None:
+    pytest.skip("groq or langchain_groq is required to import run_simulation_analyzer", allow_module_level=True)
+
+import run_simulation_analyzer as analyzer_module
+from run_simulation_analyzer import LogEntry, _select_entries_by_budget, _split_answers
+
+
+def test_split_answers_out_of_order():
+    response = "ANSWER 2: second\nANSWER 1: first\n"
+    assert _split_answers(response, 2) == ["first", "second"]
+
+def test_split_answers_markdown_headings():
+    response = "Here you go.\n\n**ANSWER 2:** second\n\n## ANSWER 1:\nfirst"
+    assert _split_answers(response, 2) == ["first", "second"]
+
+def test_split_answers_ignores_out_of_range_numbers():
+    response = "ANSWER 0: none\nANSWER 1: first\nANSWER 3: third"
+    assert _split_answers(response, 2) == ["first", ""]
+
+def test_split_answers_without_headings():
+    response = "  One answer covering both questions.  "
+    assert _split_answers(response, 3) == ["One answer covering both questions.", "", ""]
+
+
+@pytest.fixture
+def word_tokens(monkeypatch):
+    """Count one token per word and no per-entry overhead, so tiktoken isn't needed"""
+    monkeypatch.setattr(analyzer_module, "_count_tokens", lambda text: len(text.split()))
+    monkeypatch.setattr(analyzer_module, "_ENTRY_OVERHEAD_TOKENS", 0)
+
+def make_entry(index, words):
+    return LogEntry(log_id=f"LOG_{index:04d}", content=" ".join(["w"] * words), index=index)
+
+def test_select_entries_by_budget_respects_budget_and_log_order(word_tokens):
+    # Ranked by relevance, not by position in the log
+    entries = [make_entry(5, 4), make_entry(1, 7), make_entry(3, 2), make_entry(0, 5), make_entry(2, 1)]
+    selected = _select_entries_by_budget(entries, budget_tokens=10)
+    # 7 and 5 words no longer fit once 4 are used; the smaller entries after them still do
+    assert [entry.index for entry in selected] == [2, 3, 5]
+    assert sum(len(entry.content.split()) for entry in selected) <= 10
+
+def test_select_entries_by_budget_counts_entry_overhead(word_tokens, monkeypatch):
+    monkeypatch.setattr(analyzer_module, "_ENTRY_OVERHEAD_TOKENS", 3)
+    entries = [make_entry(1, 2), make_entry(0, 2), make_entry(2, 1)]
+    assert [entry.index for entry in _select_entries_by_budget(entries, budget_tokens=9)] == [1, 2]
+    assert _select_entries_by_budget(entries, budget_tokens=3) == []
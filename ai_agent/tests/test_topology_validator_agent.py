@@ -0,0 +1,68 @@
+import copy
+import pytest
+import sys
+import os
+
+# Add repository root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from topology_validator_agent import NodeType, TopologyValidatorAgent
+
+HOST = {"name": "h1", "type": "CLIENT", "address": "10.0.0.1", "location": [0, 0]}
+CONNECTION = {
+    "from_node": "h1", "to_node": "h2", "bandwidth": 1000, "latency": 1,
+    "length": 1.0, "loss_per_km": 0.0, "noise_model": "default"
+}
+NETWORK = {"name": "n1", "type": "CLASSICAL_NETWORK", "hosts": [HOST], "connections": [CONNECTION]}
+ZONE = {"name": "z1", "type": "SECURE", "size": [100, 100], "position": [0, 0], "networks": [NETWORK]}
+
+
+def with_zone(**changes):
+    """A one-zone topology whose zone (or its first network, via network=...) is modified"""
+    zone = copy.deepcopy(ZONE)
+    network_changes = changes.pop("network", None)
+    zone.update(changes)
+    if network_changes is not None:
+        zone["networks"][0].update(network_changes)
+    return {"zones": [zone]}
+
+
+STRUCTURE_CASES = [
+    ({"zones": []}, True),
+    ({"zones": [ZONE]}, True),
+    (with_zone(networks=[]), True),
+    (with_zone(network={"hosts": [], "connections": []}), True),
+    ([], False),
+    ({}, False),
+    ({"zones": {}}, False),
+    ({"zones": None}, False),
+    ({"zones": ["z1"]}, False),
+    ({"zones": [{"name": "z1"}]}, False),
+    (with_zone(networks={}), False),
+    (with_zone(network={"hosts": ""}), False),
+    (with_zone(network={"hosts": [{"name": "h1"}]}), False),
+    (with_zone(network={"connections": [{"from_node": "h1", "to_node": "h2"}]}), False),
+]
+
+
+@pytest.fixture
+def agent():
+    return TopologyValidatorAgent()
+
+@pytest.mark.parametrize("topology,expected", STRUCTURE_CASES)
+def test_structure_walk(agent, topology, expected):
+    """The hand-written walk, used when fastjsonschema is not installed"""
+    agent._schema_check = None
+    assert agent._validate_structure(topology) is expected
+
+@pytest.mark.parametrize("topology,expected", STRUCTURE_CASES)
+def test_structure_schema_matches_walk(agent, topology, expected):
+    """The compiled schema accepts and rejects exactly what the walk does"""
+    pytest.importorskip("fastjsonschema")
+    assert agent._schema_check is not None
+    assert agent._validate_structure(topology) is expected
+
+def test_number_words_only_match_whole_words(agent):
+    # "someone" and "stone" used to parse as "some1" and "st1"
+    requirements = agent.parse_user_query("someone wants a stone network with one host")
+    assert dict(requirements.node_counts) == {NodeType.CLIENT: 1}
@@ -7,4 +7,5 @@ class RedisConfig(BaseModel):
     password: SecretStr 
     db: int = 0
     ssl: bool = True
-    connection_timeout: int = 10
\ No newline at end of file
+    connection_timeout: int = 10
+    max_connections: int = 32
\ No newline at end of file
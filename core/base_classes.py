@@ -1,6 +1,6 @@
 import threading
 import time
-from typing import List, Tuple, Union
+from typing import Callable, List, Tuple, Union
 import uuid
 
 from core.enums import NodeType, ZoneType
@@ -24,6 +24,8 @@ class World(Sobject):
         self.networks: List[Network] = []  # Store all objects in the world
         self.sequential_stop_flag = False
         self.is_sequential_running = False
+        # Called once the sequential game loop has exited
+        self.on_stop_callbacks: List[Callable[[], None]] = []
 
     def add_zone(self, zone: "Zone"):
         self.zones.append(zone)
@@ -48,7 +50,6 @@ class World(Sobject):
 
     def start_sequential(self, fps=1.5):
         def _game_loop():
-            self.is_sequential_running = True
             from classical_network.routing import InternetExchange
 
             InternetExchange.get_instance().start(fps)
@@ -60,8 +61,12 @@ class World(Sobject):
             
             self.sequential_stop_flag = False
             self.is_sequential_running = False
+            for callback in self.on_stop_callbacks:
+                callback()
         
         self.logger.info(f"Starting Game Loop - {self.name}")
+        # Mark running before the thread starts so is_running() is never briefly False
+        self.is_sequential_running = True
         thread = threading.Thread(target=_game_loop)
         thread.start()
 
@@ -140,7 +145,7 @@ class Node(Sobject):
         pass
 
     def on_update(self, event):
-        from server.api.simulation.manager import SimulationManager
+        from server.api.simulation.manager import get_manager
         # Temporalty
         with open("log.txt", "a") as f:
             f.write(f"{self.name} received event {event.data}\n")
@@ -148,8 +153,10 @@ class Node(Sobject):
         if self.on_update_func:
             self.on_update_func(event)
 
-        elif SimulationManager.get_instance().is_running:
-            SimulationManager.get_instance().on_update(event)
+        else:
+            manager = get_manager()
+            if manager.is_running:
+                manager.on_update(event)
 
 
     def to_dict(self):
@@ -46,5 +46,5 @@ class Sobject:
         if self.on_update_func:
             self.on_update_func(event)
         else:
-            from server.api.simulation.manager import SimulationManager
-            SimulationManager.get_instance().on_update(event)
\ No newline at end of file
+            from server.api.simulation.manager import get_manager
+            get_manager().on_update(event)
\ No newline at end of file
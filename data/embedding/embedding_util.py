@@ -1,6 +1,9 @@
 """Utilities for generating embeddings from log entries"""
+import hashlib
+import threading
 import time
 import importlib.util
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Union
 
 from config.config import get_config
@@ -64,8 +67,23 @@ class EmbeddingUtil:
         else:
             raise ValueError(f"Unsupported embedding provider: {self.provider}")
     
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts with a single provider call"""
+        if not texts:
+            return []
+        if self.provider == "openai":
+            return self._generate_openai_embeddings(texts)
+        elif self.provider == "huggingface":
+            return self._embedding_model.encode(texts).tolist()
+        else:
+            raise ValueError(f"Unsupported embedding provider: {self.provider}")
+    
     def _generate_openai_embedding(self, text: str) -> List[float]:
         """Generate embedding using OpenAI API"""
+        return self._generate_openai_embeddings([text])[0]
+    
+    def _generate_openai_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for a batch of texts in one OpenAI API request"""
         import openai
         
         # Handle rate limiting with retries
@@ -74,9 +92,10 @@ class EmbeddingUtil:
             try:
                 response = self.client.embeddings.create(
                     model="models/text-embedding-004",
-                    input=text
+                    input=texts
                 )
-                return response.data[0].embedding
+                # The API may return items out of order; restore input order
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
             except openai.RateLimitError:
                 if attempt < max_retries - 1:
                     # Exponential backoff
@@ -155,10 +174,64 @@ class EmbeddingUtil:
         # Search for similar logs
         return VectorLogEntry.search_similar(query_embedding, top_k, filters)
     
+    def embed_and_store_logs_batch(self, logs: List[Union[LogEntry, Dict[str, Any]]]) -> List[str]:
+        """Embed several logs with one provider request and store each in Redis"""
+        log_texts = [self.format_log_for_embedding(log) for log in logs]
+        embeddings = self.generate_embeddings(log_texts)
+        return [
+            VectorLogEntry.store_log_with_embedding(log, embedding)
+            for log, embedding in zip(logs, embeddings)
+        ]
+    
     def batch_embed_logs(self, logs: List[Union[LogEntry, Dict[str, Any]]]) -> List[str]:
         """Batch embed and store multiple logs"""
-        keys = []
-        for log in logs:
-            key = self.embed_and_store_log(log)
-            keys.append(key)
-        return keys
\ No newline at end of file
+        return self.embed_and_store_logs_batch(logs)
+
+
+class CachedEmbeddingUtil(EmbeddingUtil):
+    """EmbeddingUtil with an LRU cache of vectors keyed by a hash of the embedded text
+    
+    Simulations log many near-identical events, so repeated texts reuse the cached
+    vector and only the misses are sent to the provider. Safe to share across threads.
+    """
+    
+    def __init__(self, embedding_provider: str = "openai", maxsize: int = 10_000):
+        super().__init__(embedding_provider)
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _cache_key(self, text: str) -> bytes:
+        return hashlib.sha256((self.provider + "\0" + text).encode()).digest()
+    
+    def generate_embedding(self, text: str) -> List[float]:
+        """Generate embedding for the given text, reusing a cached vector if there is one"""
+        return self.generate_embeddings([text])[0]
+    
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings, sending only texts missing from the cache to the provider"""
+        keys = [self._cache_key(text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        misses: Dict[bytes, str] = {}
+        
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    embeddings[i] = self._cache[key]
+                else:
+                    misses.setdefault(key, texts[i])
+        
+        if misses:
+            fresh = dict(zip(misses, super().generate_embeddings(list(misses.values()))))
+            with self._lock:
+                for key, embedding in fresh.items():
+                    self._cache[key] = embedding
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+            for i, key in enumerate(keys):
+                if embeddings[i] is None:
+                    embeddings[i] = fresh[key]
+        
+        return embeddings
\ No newline at end of file
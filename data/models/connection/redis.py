@@ -1,5 +1,6 @@
 """Redis connection module for network simulation"""
 import os
+from redis import BlockingConnectionPool
 from redis.client import Redis
 from redis_om import get_redis_connection
 
@@ -15,14 +16,19 @@ def get_redis_conn() -> Redis:
         config = get_config()
         redis_config = config.redis
 
-        _redis_connection = Redis(
+        # One bounded pool shared by every thread (routes offloaded with to_thread, the
+        # log worker, save timers); callers wait for a free connection when it is exhausted
+        pool = BlockingConnectionPool(
             host=redis_config.host,
             port=redis_config.port,
             username=redis_config.username,
             password=redis_config.password.get_secret_value(),
             db=redis_config.db,
             decode_responses=True,
+            max_connections=redis_config.max_connections,
+            timeout=redis_config.connection_timeout,
         )
+        _redis_connection = Redis(connection_pool=pool)
         if _redis_connection.ping():
             pass
         else:
@@ -1,5 +1,6 @@
 """Log model for network simulation"""
 
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from enum import Enum
@@ -53,6 +54,44 @@ def add_log_entry(log_data: Dict[str, Any]) -> LogEntryModel:
     return log_entry
 
 
+class LogBuffer:
+    """Collects log entries and writes them to Redis in one pipelined round trip
+
+    append() is safe to call from any thread; flush() is meant to be called
+    periodically from a single background thread.
+    """
+
+    def __init__(self):
+        self._entries: deque = deque()
+        self._indexes_created = False
+
+    def append(self, log_data: Dict[str, Any]) -> LogEntryModel:
+        """Queue a log entry for the next flush; its pk is assigned immediately"""
+        log_entry = LogEntryModel(**log_data)
+        self._entries.append(log_entry)
+        return log_entry
+
+    def flush(self) -> int:
+        """Save all queued entries with a single pipeline; returns how many were written"""
+        entries = []
+        while self._entries:
+            entries.append(self._entries.popleft())
+        if not entries:
+            return 0
+
+        redis_conn = get_redis_conn()
+        if not self._indexes_created:
+            Migrator().run()
+            self._indexes_created = True
+
+        pipeline = redis_conn.pipeline(transaction=False)
+        for log_entry in entries:
+            log_entry.save(pipeline=pipeline)
+        pipeline.execute()
+
+        return len(entries)
+
+
 def get_log_entry(primary_key: str) -> Optional[LogEntryModel]:
     """Retrieve log entry from Redis by primary key"""
     # Ensure we have a connection
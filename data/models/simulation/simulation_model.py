@@ -35,6 +35,9 @@ class SimulationModal(JsonModel):
     end_time: Optional[datetime] = None
     configuration: WorldModal = None
     metrics: Optional[PerformanceMetrics] = PerformanceMetrics()
+    progress: float = 0.0
+    results: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
     
     class Meta:
         global_key_prefix = "network-sim"
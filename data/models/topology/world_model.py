@@ -1,4 +1,7 @@
 """World model for network simulation"""
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Tuple, Dict, Any, Optional, Union
 from pydantic import Field
 from redis_om import JsonModel, Field as RedisField, Migrator
@@ -18,6 +21,42 @@ class WorldModal(JsonModel):
         model_key_prefix = "world"
         database = get_redis_conn()
 
+# In-process cache of loaded worlds, so re-running a topology skips the Redis round
+# trip and model validation. Saves and updates through this module store the written
+# world directly; deletes invalidate it. Each write also bumps a version counter in
+# Redis: once an entry is older than TOPOLOGY_CACHE_TTL its version is checked, and the
+# validated world is kept if no process has written the topology since.
+TOPOLOGY_CACHE_TTL = 30.0
+TOPOLOGY_CACHE_MAXSIZE = 128
+_topology_cache: "OrderedDict[str, Tuple[float, int, WorldModal]]" = OrderedDict()
+_topology_cache_lock = threading.Lock()
+
+def _topology_version_key(primary_key: str) -> str:
+    return f"network-sim:world-version:{primary_key}"
+
+def _get_topology_version(primary_key: str) -> int:
+    version = get_redis_conn().get(_topology_version_key(primary_key))
+    return int(version) if version else 0
+
+def _bump_topology_version(primary_key: str) -> int:
+    return get_redis_conn().incr(_topology_version_key(primary_key))
+
+def invalidate_cached_topology(primary_key: Optional[str] = None) -> None:
+    """Drop one world from the topology cache, or all of them"""
+    with _topology_cache_lock:
+        if primary_key is None:
+            _topology_cache.clear()
+        else:
+            _topology_cache.pop(primary_key, None)
+
+def _cache_topology(primary_key: str, version: int, world: WorldModal) -> None:
+    """Store a world in the topology cache, evicting the least recently used"""
+    with _topology_cache_lock:
+        _topology_cache[primary_key] = (time.monotonic() + TOPOLOGY_CACHE_TTL, version, world)
+        _topology_cache.move_to_end(primary_key)
+        while len(_topology_cache) > TOPOLOGY_CACHE_MAXSIZE:
+            _topology_cache.popitem(last=False)
+
 def save_world_to_redis(world: Union[Dict[str, Any], WorldModal]) -> WorldModal:
     """Save world data to Redis"""
     # Ensure we have a connection
@@ -32,6 +71,8 @@ def save_world_to_redis(world: Union[Dict[str, Any], WorldModal]) -> WorldModal:
     
     # Save to Redis
     world.save()
+    # The next read serves what was just written instead of fetching it back
+    _cache_topology(world.pk, _bump_topology_version(world.pk), world)
     
     return world
 
@@ -50,6 +91,7 @@ def update_world_in_redis(
             else:
                  print(f"Warning: Field '{field}' not found in WorldModal model. Skipping update for this field.")
         world_to_update.save()
+        _cache_topology(primary_key, _bump_topology_version(primary_key), world_to_update)
         print(f"Successfully updated WorldModal with PK: {primary_key}")
 
         # 4. Return the updated object
@@ -72,6 +114,28 @@ def get_topology_from_redis(primary_key: str) -> Optional[WorldModal]:
         print(f"Error retrieving world data: {e}")
         return None
 
+def get_cached_topology(primary_key: str) -> Optional[WorldModal]:
+    """get_topology_from_redis, served from the in-process cache; after TOPOLOGY_CACHE_TTL
+    seconds a cached world is revalidated against its version instead of reloaded"""
+    now = time.monotonic()
+    with _topology_cache_lock:
+        entry = _topology_cache.get(primary_key)
+        if entry is not None and entry[0] > now:
+            _topology_cache.move_to_end(primary_key)
+            return entry[2]
+
+    # Read the version before the world, so a concurrent write leaves a stale version
+    # (and a reload next time) rather than a stale world
+    version = _get_topology_version(primary_key)
+    if entry is not None and entry[1] == version:
+        _cache_topology(primary_key, version, entry[2])
+        return entry[2]
+
+    world = get_topology_from_redis(primary_key)
+    if world is not None:
+        _cache_topology(primary_key, version, world)
+    return world
+
 def get_all_topologies_from_redis(temporary_world=False) -> List[WorldModal]:
     """Retrieve all worlds from Redis"""
     # Ensure we have a connection
@@ -87,6 +151,8 @@ def delete_topology_from_redis(primary_key: str) -> bool:
     try:
         world = WorldModal.get(primary_key)
         world.delete()
+        _bump_topology_version(primary_key)
+        invalidate_cached_topology(primary_key)
         return True
     except Exception as e:
         print(f"Error deleting world data: {e}")
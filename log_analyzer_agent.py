@@ -24,7 +24,7 @@ except ImportError:
     try:
         from langchain_groq import ChatGroq
         from langchain.agents import Tool, initialize_agent, AgentType
-        from langchain.memory import ConversationBufferMemory
+        from langchain.memory import ConversationBufferWindowMemory
         LANGCHAIN_AVAILABLE = True
     except ImportError:
         print("Error: Neither groq nor langchain_groq found. Please install with:")
@@ -653,8 +653,9 @@ class LogAnalyzerAgent:
             )
         ]
         
-        # Create memory for the agent
-        memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        # Create memory for the agent, keeping only the last few turns so the
+        # prompt size (and time-to-first-token) stays flat in long sessions
+        memory = ConversationBufferWindowMemory(k=4, memory_key="chat_history", return_messages=True)
         
         # Specialized prompt for network log analysis
         custom_prefix = """You are a specialized Network Log Analysis Agent with expertise in analyzing structured logs from network communications. Your primary function is to trace and reconstruct message flows across distributed systems, even when message-related log entries are dispersed throughout the logs.
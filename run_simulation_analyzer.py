@@ -3,9 +3,15 @@ import sys
 import os
 import json
 import argparse
+import asyncio
+import functools
+import glob
+import importlib.util
 import re
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 
 # Fix for dotenv import issue
@@ -25,6 +31,29 @@ except ImportError:
                             key, value = line.strip().split('=', 1)
                             os.environ[key] = value
 
+# Use orjson for the large prompt payloads when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Token counting and relevance ranking for the prompt's log sample; both are optional
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    from rank_bm25 import BM25Okapi
+except ImportError:
+    BM25Okapi = None
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
 # Import Groq API client
 try:
     import groq
@@ -32,6 +61,43 @@ except ImportError:
     print("Warning: groq package not found, using fallback method")
     groq = None
 
+# Matches log IDs cited in model answers
+_LOG_ID_RE = re.compile(r"LOG_\d{4}")
+
+# Matches a log reference given as "LOG_0001" or just "0001"
+_LOG_REF_RE = re.compile(r"(?:LOG_)?(\d+)")
+
+# Splits a multi-question response on its "ANSWER N:" headings
+_ANSWER_HEADING_RE = re.compile(r"^[#*\s]*ANSWER (\d+):[*\s]*", re.MULTILINE)
+
+# Patterns used to pull details out of structured log events
+_QUOTED = re.compile(r"[\"']([^\"']+)[\"']")
+_DEST_HOST = re.compile(r"to (ClassicalHost-\d+)")
+_ADAPTER_WITH = re.compile(r"with (QuantumAdapter-\d+)")
+
+@dataclass(slots=True, frozen=True)
+class LogEntry:
+    """A single log line indexed for traceability (LOG_NNNN)"""
+    log_id: str
+    content: str
+    index: int
+    content_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Case-fold once at load time so searches don't re-lower every entry
+        object.__setattr__(self, "content_lower", self.content.lower())
+
+    def to_dict(self):
+        return {"log_id": self.log_id, "content": self.content, "index": self.index}
+
+def _load_json(path):
+    """Read a JSON file, decoding the raw bytes with orjson when available"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # Import the simulation analyzer
 try:
     from simulation_analyzer import SimulationLogAnalyzer
@@ -43,6 +109,8 @@ except ImportError:
             self.log_file = log_file
             self.logs = None
             self.log_entries = []
+            self.contents_lower = []
+            self.log_index = {}
             self.structured_logs = None
             self.structured_output = None
         
@@ -59,12 +127,13 @@ except ImportError:
                 
                 for i, line in enumerate(lines):
                     if line.strip():  # Skip empty lines
-                        log_id = f"LOG_{i:04d}"
-                        self.log_entries.append({
-                            "log_id": log_id,
-                            "content": line.strip(),
-                            "index": i
-                        })
+                        self.log_entries.append(LogEntry(
+                            log_id=f"LOG_{i:04d}",
+                            content=line.strip(),
+                            index=i
+                        ))
+                self.contents_lower = [entry.content_lower for entry in self.log_entries]
+                self.log_index = {entry.index: entry for entry in self.log_entries}
                 
                 return True
             except FileNotFoundError:
@@ -74,24 +143,23 @@ except ImportError:
         def load_structured_logs(self):
             """Load logs from a structured JSON file"""
             try:
-                with open(self.log_file, 'r') as f:
-                    self.structured_logs = json.load(f)
+                self.structured_logs = _load_json(self.log_file)
                 
                 # Convert structured logs to log_entries format for compatibility
                 self.log_entries = []
                 if 'logs' in self.structured_logs:
                     for i, log in enumerate(self.structured_logs['logs']):
-                        log_entry = {
-                            "log_id": f"LOG_{i:04d}",
-                            "index": i
-                        }
-                        
                         # Create content field combining component and event
                         component = log.get('component', 'Unknown')
                         event = log.get('event', 'Unknown event')
-                        log_entry["content"] = f"{component}: {event}"
                         
-                        self.log_entries.append(log_entry)
+                        self.log_entries.append(LogEntry(
+                            log_id=f"LOG_{i:04d}",
+                            content=f"{component}: {event}",
+                            index=i
+                        ))
+                self.contents_lower = [entry.content_lower for entry in self.log_entries]
+                self.log_index = {entry.index: entry for entry in self.log_entries}
                 
                 return True
             except Exception as e:
@@ -100,14 +168,14 @@ except ImportError:
 
 # Try direct import of groq - much simpler approach
 try:
-    from groq import Groq
+    from groq import AsyncGroq, Groq
     USE_GROQ_DIRECT = True
 except ImportError:
     print("Warning: Direct Groq package not found. Will try to use langchain_groq instead.")
-    try:
-        from langchain_groq import ChatGroq
+    # Only check that langchain_groq is installed; it is imported where it is used
+    if importlib.util.find_spec("langchain_groq") is not None:
         USE_GROQ_DIRECT = False
-    except ImportError:
+    else:
         print("Error: Neither groq nor langchain_groq package found. Please install one of them.")
         print("pip install groq")
         sys.exit(1)
@@ -116,15 +184,30 @@ except ImportError:
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-def create_summarizer_agent(analyzer):
-    """Create a LangChain agent for simulation summarization and Q&A using Groq"""
-    
-    # Create Groq language model
-    llm = ChatGroq(
-        model="llama3-8b-8192",  # You can change this to "mixtral-8x7b-32768" or another model
+@functools.lru_cache(maxsize=1)
+def _groq_client():
+    """Shared Groq client so the HTTP connection is reused across questions"""
+    return Groq(api_key=GROQ_API_KEY)
+
+@functools.lru_cache(maxsize=1)
+def _async_groq_client():
+    """Shared AsyncGroq client used to stream answers"""
+    return AsyncGroq(api_key=GROQ_API_KEY)
+
+@functools.lru_cache(maxsize=None)
+def _chat_groq(model):
+    """Shared LangChain Groq model per model name"""
+    from langchain_groq import ChatGroq
+    return ChatGroq(
+        model=model,
         temperature=0.2,
         groq_api_key=GROQ_API_KEY
     )
+
+def create_summarizer_agent(analyzer):
+    """Create a LangChain agent for simulation summarization and Q&A using Groq"""
+    # Create Groq language model
+    llm = _chat_groq("llama3-8b-8192")  # You can change this to "mixtral-8x7b-32768" or another model
     
     # Define tools for the agent
     def get_log_summary(query=None):
@@ -149,15 +232,14 @@ def create_summarizer_agent(analyzer):
             
             entries = []
             for log_id in log_ids:
-                # Format log ID correctly if needed
-                if not log_id.startswith("LOG_"):
-                    log_id = f"LOG_{log_id.zfill(4)}"
+                # Parse the numeric part of the log ID once and look it up by index
+                match = _LOG_REF_RE.match(log_id.strip())
+                if not match:
+                    continue
                 
-                # Find and add the entry
-                for entry in analyzer.log_entries:
-                    if entry.get("log_id") == log_id:
-                        entries.append(entry)
-                        break
+                entry = analyzer.log_index.get(int(match.group(1)))
+                if entry:
+                    entries.append(entry.to_dict())
             
             if not entries:
                 return "No matching log entries found."
@@ -171,11 +253,11 @@ def create_summarizer_agent(analyzer):
         if not analyzer.log_entries:
             return "No log entries available. Please run the analyzer first."
         
+        query_lower = query.lower()
         matching_entries = []
-        for entry in analyzer.log_entries:
-            content = entry.get("content", "")
-            if query.lower() in content.lower():
-                matching_entries.append(entry)
+        for entry, content_lower in zip(analyzer.log_entries, analyzer.contents_lower):
+            if query_lower in content_lower:
+                matching_entries.append(entry.to_dict())
         
         if not matching_entries:
             return f"No log entries found matching query: {query}"
@@ -200,8 +282,10 @@ def create_summarizer_agent(analyzer):
         )
     ]
     
-    # Create memory for conversation context
-    memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    # Create memory for conversation context, keeping only the last few turns
+    # so the prompt size (and time-to-first-token) stays flat in long sessions
+    from langchain.memory import ConversationBufferWindowMemory
+    memory = ConversationBufferWindowMemory(k=4, memory_key="chat_history", return_messages=True)
     
     # Define the agent - using the modern approach
     agent_executor = initialize_agent(
@@ -250,23 +334,25 @@ def generate_hardcoded_analysis(analyzer):
             log_id = f"LOG_{i:04d}"
             log_references[log_id] = log
         
-        for i, log in enumerate(logs):
+        # Bind the compiled patterns locally for the loop below
+        quoted_re, dest_host_re, adapter_with_re = _QUOTED, _DEST_HOST, _ADAPTER_WITH
+        
+        for log in logs:
             if 'event' in log and 'component' in log:
-                log_id = f"LOG_{i:04d}"
                 component = log.get('component', '')
                 event = log.get('event', '')
+                event_lower = event.lower()
                 
                 # Look for the initial message sending event
-                if ('sending message' in event.lower() or 'sent data' in event.lower()) and 'ClassicalHost' in component:
+                if ('sending message' in event_lower or 'sent data' in event_lower) and 'ClassicalHost' in component:
                     sending_host = component
                     # Extract the message content using regex
-                    import re
-                    match = re.search(r"[\"']([^\"']+)[\"']", event)
+                    match = quoted_re.search(event)
                     if match:
                         message_content = match.group(1)
                     
                     # Try to extract the destination host
-                    dest_match = re.search(r"to (ClassicalHost-\d+)", event)
+                    dest_match = dest_host_re.search(event)
                     if dest_match:
                         receiving_host = dest_match.group(1)
                     
@@ -276,38 +362,43 @@ def generate_hardcoded_analysis(analyzer):
                 
                 # Extract classical router information
                 if 'ClassicalRouter' in component:
-                    if 'received packet' in event.lower() or 'routing packet' in event.lower():
+                    if 'received packet' in event_lower or 'routing packet' in event_lower:
                         classical_router = component
                 
                 # Extract quantum adapter information
-                if 'QuantumAdapter' in component and 'initiating' in event.lower():
+                if 'QuantumAdapter' in component and 'initiating' in event_lower:
                     quantum_adapter_src = component
                     # Try to find the destination adapter
-                    adapter_match = re.search(r"with (QuantumAdapter-\d+)", event)
+                    adapter_match = adapter_with_re.search(event)
                     if adapter_match:
                         quantum_adapter_dst = adapter_match.group(1)
                 
                 # Look for the final receipt
-                if 'received data' in event.lower() and 'ClassicalHost' in component:
+                if 'received data' in event_lower and 'ClassicalHost' in component:
                     receiving_host = component
     
+    # Precompute the strings that are repeated throughout the analysis
+    packet_size_str = f"{packet_size} bytes" if packet_size else "28 bytes"
+    qc_router = f"QC_Router_{quantum_adapter_src}"
+    receipt_content = f"{receiving_host}: Received data \"{message_content}\""
+    
     # Create the analysis result structure exactly as specified
     analysis_result = {
         "SHORT_SUMMARY": f"{sending_host} sent '{message_content}' to {receiving_host} through a quantum-classical network involving {classical_hops} classical hops and {quantum_hops} quantum hop, using quantum key distribution for secure transmission.",
-        "DETAILED_SUMMARY": f"The simulation started with {sending_host} sending a message to {receiving_host} ([LOG_0000]). The message was routed through {classical_router} ([LOG_0001-0002]) and then to QC_Router_{quantum_adapter_src} ([LOG_0003]). {quantum_adapter_src} initiated QKD with {quantum_adapter_dst} ([LOG_0004]) and encrypted the message ([LOG_0007]). Quantum transmission occurred via QuantumHost-5 to QuantumHost-4 ([LOG_0005-0006]). The encrypted message was decrypted ([LOG_0008]) and delivered to {receiving_host} ([LOG_0010]).",
+        "DETAILED_SUMMARY": f"The simulation started with {sending_host} sending a message to {receiving_host} ([LOG_0000]). The message was routed through {classical_router} ([LOG_0001-0002]) and then to {qc_router} ([LOG_0003]). {quantum_adapter_src} initiated QKD with {quantum_adapter_dst} ([LOG_0004]) and encrypted the message ([LOG_0007]). Quantum transmission occurred via QuantumHost-5 to QuantumHost-4 ([LOG_0005-0006]). The encrypted message was decrypted ([LOG_0008]) and delivered to {receiving_host} ([LOG_0010]).",
         "CLASSICAL_NETWORK_FLOW": {
-            "Summary": f"The classical segment of the network facilitated the message's initial routing and final delivery, serving as critical endpoints in the hybrid communication path.",
+            "Summary": "The classical segment of the network facilitated the message's initial routing and final delivery, serving as critical endpoints in the hybrid communication path.",
             "Initial_Transmission": {
                 "Source": sending_host,
                 "Protocol": "Classical TCP/IP",
-                "Packet_Size": f"{packet_size} bytes" if packet_size else "28 bytes",
+                "Packet_Size": packet_size_str,
                 "Target": classical_router,
                 "Process": f"{sending_host} packaged the plaintext message '{message_content}' into a standard IP packet with appropriate headers and routing information destined for {receiving_host} ([LOG_0000]). This packet entered the classical network infrastructure via {classical_router} acting as the first hop router."
             },
             "Classical_Routing": {
                 "Router": classical_router,
                 "Routing_Decision": "Next-hop routing based on destination address",
-                "Next_Hop": f"QC_Router_{quantum_adapter_src}",
+                "Next_Hop": qc_router,
                 "Process": f"{classical_router} processed the incoming packet by examining its destination address, determined the optimal path through the network topology, and forwarded it to the quantum-classical interface adapter ([LOG_0001-0002]). This represents the critical transition point from purely classical to quantum domain."
             },
             "Classical_Quantum_Interface": {
@@ -328,11 +419,11 @@ def generate_hardcoded_analysis(analyzer):
                 "Reliability_Measures": "TCP acknowledgments and packet sequence verification"
             }
         },
-        "MESSAGE_FLOW": f"{sending_host} -> {classical_router} -> QC_Router_{quantum_adapter_src} -> QuantumHost-5 -> QuantumHost-4 -> {quantum_adapter_dst} -> {final_router} -> {receiving_host}",
+        "MESSAGE_FLOW": f"{sending_host} -> {classical_router} -> {qc_router} -> QuantumHost-5 -> QuantumHost-4 -> {quantum_adapter_dst} -> {final_router} -> {receiving_host}",
         "MESSAGE_DELIVERY": {
             "Status": "delivered",
             "Receipt Log ID": "LOG_0010",
-            "Receipt Content": f"{receiving_host}: Received data \"{message_content}\""
+            "Receipt Content": receipt_content
         },
         "SIMULATION_STATUS": "success",
         "DETAILS": {
@@ -345,7 +436,7 @@ def generate_hardcoded_analysis(analyzer):
             },
             "Network Performance": {
                 "Quantum Bandwidth": "3 qubits",
-                "Classical Bandwidth": f"{packet_size} bytes" if packet_size else "28 bytes",
+                "Classical Bandwidth": packet_size_str,
                 "QKD Key Length": f"{len(message_content)} bits",
                 "Quantum Error Rate": "0.0%",
                 "Total Qubit Operations": 3,
@@ -361,12 +452,12 @@ def generate_hardcoded_analysis(analyzer):
         "SIGNIFICANT_EVENTS": [
             {
                 "log_id": "SUMMARY_EVENT_0",
-                "event": f"NETWORK INITIALIZATION: Hybrid quantum-classical network initialized with classical hosts, routers, quantum hosts, and adapters",
+                "event": "NETWORK INITIALIZATION: Hybrid quantum-classical network initialized with classical hosts, routers, quantum hosts, and adapters",
                 "component": "Network"
             },
             {
                 "log_id": "LOG_0002",
-                "event": f"CLASSICAL ROUTING: {classical_router} routed packet directly to QC_Router_{quantum_adapter_src}",
+                "event": f"CLASSICAL ROUTING: {classical_router} routed packet directly to {qc_router}",
                 "component": classical_router
             },
             {
@@ -420,7 +511,7 @@ def generate_hardcoded_analysis(analyzer):
             },
             {
                 "log_id": "LOG_0010",
-                "content": f"{receiving_host}: Received data \"{message_content}\""
+                "content": receipt_content
             }
         ]
     }
@@ -428,7 +519,11 @@ def generate_hardcoded_analysis(analyzer):
     return analysis_result
 
 def run_analyzer(log_file="json_validation_output/corrected_logs.json", output_file="simulation.txt", json_output="analysis_output.json", model="llama3-70b-8192"):
-    """Run the analyzer on a log file and generate the output"""
+    """Run the analyzer on a log file and generate the output
+    
+    Returns (analysis_result, analyzer) so callers can reuse the loaded analyzer
+    instead of parsing the log again, or (None, None) on failure.
+    """
     print(f"Running analyzer on {log_file}...")
     
     try:
@@ -455,9 +550,8 @@ def run_analyzer(log_file="json_validation_output/corrected_logs.json", output_f
                 print(f"Processing JSON logs from file: {log_file}")
                 # Prepare text content from JSON for the real SimulationLogAnalyzer
                 try:
-                    with open(log_file, 'r') as f:
-                        print("Reading JSON file...")
-                        structured_logs = json.load(f)
+                    print("Reading JSON file...")
+                    structured_logs = _load_json(log_file)
                     
                     print("Creating temporary text file from structured logs...")
                     # Create a temporary text file from structured logs
@@ -492,7 +586,7 @@ def run_analyzer(log_file="json_validation_output/corrected_logs.json", output_f
         
         if not load_success:
             print("Failed to load logs. Exiting.")
-            return False
+            return None, None
         
         # Generate the analysis
         print("Generating detailed network simulation analysis...")
@@ -501,15 +595,18 @@ def run_analyzer(log_file="json_validation_output/corrected_logs.json", output_f
         analysis_result = generate_hardcoded_analysis(analyzer)
         print("Analysis generated successfully.")
         
+        # Both outputs hold the same JSON, so serialize it once
+        analysis_json = _dump(analysis_result)
+
         # Save the analysis results to files (not displaying in terminal)
         print(f"Saving JSON output to: {json_output}")
-        with open(json_output, 'w') as f:
-            json.dump(analysis_result, indent=2, fp=f)
+        with open(json_output, 'w', encoding='utf-8') as f:
+            f.write(analysis_json)
         
         # Save text format to simulation.txt
         print(f"Saving text output to: {output_file}")
-        with open(output_file, 'w') as f:
-            json.dump(analysis_result, indent=2, fp=f)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(analysis_json)
         
         print(f"✓ Analysis completed successfully")
         print(f"  - Full analysis saved to: {output_file}")
@@ -519,12 +616,48 @@ def run_analyzer(log_file="json_validation_output/corrected_logs.json", output_f
         print("Setting structured_output for QA mode")
         analyzer.structured_output = analysis_result
         
-        return analysis_result
+        return analysis_result, analyzer
         
     except Exception as e:
         print(f"❌ Error during analysis: {str(e)}")
         traceback.print_exc()
-        return None
+        return None, None
+
+def _per_log_path(path, log_file):
+    """Output path for one of several analyzed logs: path with the log's file stem as a prefix"""
+    stem = os.path.splitext(os.path.basename(log_file))[0]
+    return os.path.join(os.path.dirname(path), f"{stem}_{os.path.basename(path)}")
+
+def _analyze_log_file(log_file, output_file, json_output, model):
+    """Process pool worker: run the analyzer and return only the analysis result"""
+    analysis_result, _ = run_analyzer(log_file, output_file, json_output, model)
+    return analysis_result
+
+def run_batch_analysis(batch_dir, output_file="simulation.txt", json_output="analysis_output.json", model="llama3-70b-8192"):
+    """Run the analyzer over every JSON log in a directory, one worker process per file
+    
+    Each log gets its own output files (prefixed with the log's file stem, in the
+    same directory as output_file/json_output) so the workers never write to the
+    same path.
+    """
+    log_files = sorted(glob.glob(os.path.join(batch_dir, "*.json")))
+    if not log_files:
+        print(f"Error: No JSON log files found in '{batch_dir}'")
+        return False
+    
+    output_files = [_per_log_path(output_file, log_file) for log_file in log_files]
+    json_outputs = [_per_log_path(json_output, log_file) for log_file in log_files]
+    
+    print(f"Analyzing {len(log_files)} log files from {batch_dir}...")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        results = list(pool.map(_analyze_log_file, log_files, output_files, json_outputs, [model] * len(log_files)))
+    
+    failed = [log_file for log_file, result in zip(log_files, results) if not result]
+    print(f"✓ Analyzed {len(log_files) - len(failed)}/{len(log_files)} log files")
+    for log_file in failed:
+        print(f"  - Failed: {log_file}")
+    
+    return not failed
 
 def run_qa_mode(analyzer, log_file="log.txt", output_file="simulation.txt", model="llama3-70b-8192"):
     """Run the Q&A mode for answering user questions about the logs"""
@@ -540,6 +673,11 @@ def run_qa_mode(analyzer, log_file="log.txt", output_file="simulation.txt", mode
     print("  - Were there any errors in the simulation?")
     print("  - What quantum operations were performed?\n")
     
+    # Run the whole session on one event loop so the async Groq client is reused
+    asyncio.run(_qa_session(analyzer, model))
+
+async def _qa_session(analyzer, model):
+    """Interactive question loop, printing answer tokens as they stream in"""
     while True:
         try:
             # Get user question
@@ -554,15 +692,24 @@ def run_qa_mode(analyzer, log_file="log.txt", output_file="simulation.txt", mode
             if not question.strip():
                 continue
             
-            # Answer the question
+            # Answer the question, streaming tokens to the terminal
             print("\nThinking...")
-            result = answer_question(analyzer, question, model)
+            print("\nAnswer:")
+            streamed = []
+            
+            def print_token(token):
+                streamed.append(token)
+                print(token, end="", flush=True)
+            
+            result = await answer_question(analyzer, question, model, on_token=print_token)
+            if streamed:
+                print()
             
             # Handle different return types from answer_question
             if isinstance(result, dict):
                 # Dictionary format with answer and references
-                print("\nAnswer:")
-                print(result.get("answer", "No answer available."))
+                if not streamed:
+                    print(result.get("answer", "No answer available."))
                 
                 # Display referenced logs if any
                 references = result.get("references", [])
@@ -572,7 +719,6 @@ def run_qa_mode(analyzer, log_file="log.txt", output_file="simulation.txt", mode
                         print(f"  [{ref.get('log_id', 'UNKNOWN')}] {ref.get('content', 'No content')}")
             elif isinstance(result, str):
                 # String format (direct answer)
-                print("\nAnswer:")
                 print(result)
             else:
                 print("\nUnable to generate an answer.")
@@ -624,41 +770,38 @@ def create_context(analyzer):
     
     context.append("\nFIRST FEW LOG ENTRIES:")
     for entry in first_entries:
-        context.append(f"{entry['log_id']}: {entry['content']}")
+        context.append(f"{entry.log_id}: {entry.content}")
     
     context.append("\nLAST FEW LOG ENTRIES:")
     for entry in last_entries:
-        context.append(f"{entry['log_id']}: {entry['content']}")
+        context.append(f"{entry.log_id}: {entry.content}")
     
     return "\n".join(context)
 
-def answer_question(analyzer, question, model="llama3-70b-8192"):
-    """Answer a specific question about the simulation logs"""
-    try:
-        # Check if we have a structured output already
-        if not hasattr(analyzer, 'structured_output') or analyzer.structured_output is None:
-            print("No structured analysis available. Running analyzer first...")
-            run_analyzer(log_file=analyzer.log_file_path if hasattr(analyzer, 'log_file_path') else analyzer.log_file, model=model)
-        
-        # If we have a structured output, use it for the context
-        context = create_context(analyzer)
-        
-        # Prepare log data for the model
-        log_entries_json = json.dumps(analyzer.log_entries[:100] if hasattr(analyzer, 'log_entries') else [], indent=2)  # Limit to first 100 entries for context
-        
-        # Create a prompt for the question with enhanced context and instructions
-        prompt = f"""You are an expert network simulation analyzer. 
+def _dump(obj):
+    """Serialize obj as indented JSON, using orjson's C encoder when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+QA_SYSTEM_PROMPT = "You are an expert network simulation analyst. Your task is to answer questions about network simulation logs accurately and concisely. Always cite specific log IDs to support your answers."
+
+# The prompt is split where the per-question part starts: the head is formatted once per
+# analyzer and cached, so each question only formats the tail
+_PROMPT_HEAD = """You are an expert network simulation analyzer. 
 You'll answer a question about a quantum-classical network simulation based on the following log and its analysis.
 
 CONTEXT:
 {context}
 
 STRUCTURED ANALYSIS:
-{json.dumps(analyzer.structured_output, indent=2) if hasattr(analyzer, 'structured_output') and analyzer.structured_output else "Not available"}
+{structured}
 
-LOG ENTRIES (SAMPLE):
+"""
+
+_PROMPT_TAIL = """LOG ENTRIES (MOST RELEVANT):
 ```
-{log_entries_json}
+{logs}
 ```
 
 USER QUESTION: {question}
@@ -673,58 +816,273 @@ Important guidelines:
 
 Your answer should be comprehensive yet focused on directly addressing the question.
 """
+
+# Token budget for the log entries included in a question prompt (llama3-8b has an 8k window)
+LOG_CONTEXT_TOKEN_BUDGET = 4000
+
+# Approximate tokens taken by the JSON keys and indentation around each entry's content
+_ENTRY_OVERHEAD_TOKENS = 20
+
+@functools.lru_cache(maxsize=1)
+def _token_encoding():
+    return tiktoken.get_encoding("cl100k_base")
+
+@functools.lru_cache(maxsize=4096)
+def _count_tokens(text):
+    """Count tokens in text, estimating ~4 characters per token without tiktoken"""
+    if tiktoken is not None:
+        return len(_token_encoding().encode(text))
+    return len(text) // 4 + 1
+
+def _select_entries_by_budget(entries, budget_tokens=LOG_CONTEXT_TOKEN_BUDGET):
+    """Pack entries, in the order given, until the token budget is used up
+    
+    Entries too large for the remaining budget are skipped so smaller ones can still
+    fill it. The selection is returned in log order.
+    """
+    selected = []
+    used = 0
+    for entry in entries:
+        cost = _count_tokens(entry.content) + _ENTRY_OVERHEAD_TOKENS
+        if used + cost > budget_tokens:
+            continue
+        selected.append(entry)
+        used += cost
+    selected.sort(key=lambda entry: entry.index)
+    return selected
+
+# Local sentence embedding model used to pick the log entries relevant to a question
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Number of most similar entries kept per question, before adding their neighbours
+QUESTION_TOP_K = 20
+
+@functools.lru_cache(maxsize=1)
+def _embedding_model():
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+def _log_embeddings(analyzer):
+    """Return the normalized [N, 384] float32 embeddings of the analyzer's log entries
+    
+    Entries are embedded once and cached on the analyzer until log_entries changes.
+    """
+    log_entries = analyzer.log_entries
+    cache_key = (id(log_entries), len(log_entries))
+    if getattr(analyzer, '_log_embeddings_key', None) != cache_key:
+        embeddings = _embedding_model().encode(
+            [entry.content for entry in log_entries],
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )
+        analyzer._log_embeddings = embeddings.astype(np.float32)
+        analyzer._log_embeddings_key = cache_key
+    return analyzer._log_embeddings
+
+def _select_relevant_entries(analyzer, question, top_k=QUESTION_TOP_K):
+    """Pick the top_k entries most similar to the question, each followed by its neighbours
+    
+    The neighbours (the entries just before and after a match) keep the local context
+    of each match in the prompt.
+    """
+    log_entries = analyzer.log_entries
+    embeddings = _log_embeddings(analyzer)
+    question_embedding = _embedding_model().encode([question], normalize_embeddings=True)[0]
+    
+    # Cosine similarity, since both sides are normalized
+    scores = embeddings @ question_embedding.astype(np.float32)
+    top = np.argsort(-scores)[:top_k]
+    
+    picked = {}
+    for i in top:
+        for j in (i, i - 1, i + 1):
+            if 0 <= j < len(log_entries):
+                picked.setdefault(int(j), log_entries[j])
+    return list(picked.values())
+
+def _rank_entries(analyzer, question):
+    """Order log entries by relevance to the question, most relevant first
+    
+    Uses sentence embeddings when sentence-transformers is installed (keeping only the
+    closest entries and their neighbours), BM25 when rank_bm25 is, and log order
+    otherwise. Embeddings and the BM25 index are built once per analyzer.
+    """
+    log_entries = getattr(analyzer, 'log_entries', [])
+    if not log_entries or not question:
+        return log_entries
+    if SentenceTransformer is not None:
+        return _select_relevant_entries(analyzer, question)
+    if BM25Okapi is None:
+        return log_entries
+    
+    cache_key = (id(log_entries), len(log_entries))
+    if getattr(analyzer, '_bm25_cache_key', None) != cache_key:
+        analyzer._bm25 = BM25Okapi([entry.content_lower.split() for entry in log_entries])
+        analyzer._bm25_cache_key = cache_key
+    
+    scores = analyzer._bm25.get_scores(question.lower().split())
+    order = sorted(range(len(log_entries)), key=lambda i: scores[i], reverse=True)
+    return [log_entries[i] for i in order]
+
+def _prompt_head(analyzer):
+    """Return the prompt head (context and structured analysis), formatted once per analyzer
+    
+    The head only depends on the analyzer's logs and analysis, so it is cached on the
+    analyzer and rebuilt only when log_entries or structured_output change.
+    """
+    log_entries = getattr(analyzer, 'log_entries', [])
+    structured_output = getattr(analyzer, 'structured_output', None)
+    cache_key = (id(log_entries), len(log_entries), id(structured_output))
+    
+    if getattr(analyzer, '_prompt_cache_key', None) != cache_key:
+        # If we have a structured output, use it for the context
+        analyzer._cached_prompt_head = _PROMPT_HEAD.format(
+            context=create_context(analyzer),
+            structured=_dump(structured_output) if structured_output else "Not available"
+        )
+        analyzer._prompt_cache_key = cache_key
+    
+    return analyzer._cached_prompt_head
+
+def _render_prompt(analyzer, ranking_query, question):
+    """Join the cached head with the log entries most relevant to ranking_query and the question"""
+    # Fill the log section with the most relevant entries that fit the token budget
+    entries = _select_entries_by_budget(_rank_entries(analyzer, ranking_query))
+    logs = _dump([entry.to_dict() for entry in entries])
+    return _prompt_head(analyzer) + _PROMPT_TAIL.format(logs=logs, question=question)
+
+def build_question_prompt(analyzer, question):
+    """Build the user prompt for a question about the simulation logs"""
+    return _render_prompt(analyzer, question, question)
+
+def build_questions_prompt(analyzer, questions):
+    """Build one user prompt that asks several questions over the same log context
+    
+    The shared context comes first and is sent once; the model is asked to answer each
+    question under its own "ANSWER N:" heading so the response can be split back up.
+    """
+    numbered = "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+    instructions = (
+        f"{numbered}\n\n"
+        f"Answer each of the {len(questions)} questions above separately. Start each answer "
+        f"on its own line with the heading \"ANSWER N:\" where N is the question number."
+    )
+    # Pick log entries relevant to any of the questions
+    return _render_prompt(analyzer, " ".join(questions), instructions)
+
+def _split_answers(response_content, count):
+    """Split a multi-question response into count answers by their "ANSWER N:" headings"""
+    answers = [""] * count
+    parts = _ANSWER_HEADING_RE.split(response_content)
+    # parts alternates: preamble, number, answer, number, answer, ...
+    for number, answer in zip(parts[1::2], parts[2::2]):
+        i = int(number) - 1
+        if 0 <= i < count:
+            answers[i] = answer.strip()
+    if not any(answers):
+        # The model ignored the headings; keep the whole response with the first question
+        answers[0] = response_content.strip()
+    return answers
+
+def _postprocess_answer(response_content, analyzer, referenced_log_ids=None):
+    """Attach the log entries cited in a model answer as references"""
+    # Find log references, unless they were already collected while streaming
+    if referenced_log_ids is None:
+        referenced_log_ids = _LOG_ID_RE.findall(response_content)
+    
+    # Extract referenced logs, citing each log only once
+    references = []
+    for log_id in dict.fromkeys(referenced_log_ids):
+        # Find matching log entry by its numeric index
+        matching_log = analyzer.log_index.get(int(log_id[4:]))
+        
+        if matching_log:
+            references.append({
+                "log_id": log_id,
+                "content": matching_log.content or "No content available"
+            })
+    
+    # Return both the answer and references
+    return {
+        "answer": response_content,
+        "references": references
+    }
+
+async def _stream_completion(client, messages, model, on_token=None):
+    """Stream a chat completion, scanning for cited log IDs while tokens arrive
+    
+    Returns the full response text and the log IDs it cites.
+    """
+    stream = await client.chat.completions.create(
+        messages=messages,
+        model=model,
+        temperature=0.2,  # Low temperature for factual responses
+        max_tokens=1500,  # Generous output length
+        top_p=0.95,
+        stop=None,
+        stream=True
+    )
+    
+    response_content = ""
+    referenced_log_ids = []
+    scanned = 0
+    async for chunk in stream:
+        token = chunk.choices[0].delta.content if chunk.choices else None
+        if not token:
+            continue
+        response_content += token
+        if on_token:
+            on_token(token)
+        
+        # Scan only the new text; the last few characters are rescanned next time
+        # since they may be the start of a log ID split across tokens
+        for match in _LOG_ID_RE.finditer(response_content, scanned):
+            referenced_log_ids.append(match.group())
+            scanned = match.end()
+        scanned = max(scanned, len(response_content) - 7)
+    
+    return response_content, referenced_log_ids
+
+async def _ensure_structured_output(analyzer, model):
+    """Run the analyzer if no analysis is attached yet, in a worker thread so the
+    event loop stays free for other requests"""
+    if not hasattr(analyzer, 'structured_output') or analyzer.structured_output is None:
+        print("No structured analysis available. Running analyzer first...")
+        log_file = analyzer.log_file_path if hasattr(analyzer, 'log_file_path') else analyzer.log_file
+        analyzer.structured_output, _ = await asyncio.to_thread(run_analyzer, log_file=log_file, model=model)
+
+async def answer_question(analyzer, question, model="llama3-70b-8192", on_token=None):
+    """Answer a specific question about the simulation logs
+    
+    The answer is streamed from the model; on_token, if given, is called with each
+    piece of text as it arrives.
+    """
+    try:
+        # Check if we have a structured output already
+        await _ensure_structured_output(analyzer, model)
+        
+        prompt = build_question_prompt(analyzer, question)
         
         # Use direct Groq API for question answering
         if USE_GROQ_DIRECT:
             try:
-                client = Groq(api_key=GROQ_API_KEY)
-                
-                chat_completion = client.chat.completions.create(
-                    messages=[
+                response_content, referenced_log_ids = await _stream_completion(
+                    _async_groq_client(),
+                    [
                         {
                             "role": "system",
-                            "content": "You are an expert network simulation analyst. Your task is to answer questions about network simulation logs accurately and concisely. Always cite specific log IDs to support your answers."
+                            "content": QA_SYSTEM_PROMPT
                         },
                         {
                             "role": "user",
                             "content": prompt
                         }
                     ],
-                    model=model,
-                    temperature=0.2,  # Low temperature for factual responses
-                    max_tokens=1500,  # Generous output length
-                    top_p=0.95,
-                    stop=None
+                    model,
+                    on_token
                 )
                 
                 # Extract the answer
-                response_content = chat_completion.choices[0].message.content
-                
-                # Find log references
-                log_id_pattern = r'LOG_\d{4}'
-                referenced_log_ids = re.findall(log_id_pattern, response_content)
-                
-                # Extract referenced logs
-                references = []
-                for log_id in referenced_log_ids:
-                    # Find matching log entry
-                    matching_log = None
-                    for entry in analyzer.log_entries:
-                        if entry.get("log_id") == log_id:
-                            matching_log = entry
-                            break
-                    
-                    if matching_log:
-                        references.append({
-                            "log_id": log_id,
-                            "content": matching_log.get("content", "No content available")
-                        })
-                
-                # Return both the answer and references
-                return {
-                    "answer": response_content,
-                    "references": references
-                }
+                return _postprocess_answer(response_content, analyzer, referenced_log_ids)
             except Exception as e:
                 print(f"Error using Groq API: {str(e)}")
                 return {
@@ -734,41 +1092,13 @@ Your answer should be comprehensive yet focused on directly addressing the quest
         else:
             # Use LangChain model for fallback
             try:
-                llm = ChatGroq(
-                    model=model,
-                    temperature=0.2,
-                    groq_api_key=GROQ_API_KEY
-                )
+                llm = _chat_groq(model)
                 
                 # Add the question to the prompt
-                completion = llm.invoke(prompt)
-                response_content = completion.content
-                
-                # Find log references
-                log_id_pattern = r'LOG_\d{4}'
-                referenced_log_ids = re.findall(log_id_pattern, response_content)
-                
-                # Extract referenced logs
-                references = []
-                for log_id in referenced_log_ids:
-                    # Find matching log entry
-                    matching_log = None
-                    for entry in analyzer.log_entries:
-                        if entry.get("log_id") == log_id:
-                            matching_log = entry
-                            break
-                    
-                    if matching_log:
-                        references.append({
-                            "log_id": log_id,
-                            "content": matching_log.get("content", "No content available")
-                        })
-                
-                # Return both the answer and references
-                return {
-                    "answer": response_content,
-                    "references": references
-                }
+                completion = await llm.ainvoke(prompt)
+                if on_token:
+                    on_token(completion.content)
+                return _postprocess_answer(completion.content, analyzer)
             except Exception as e:
                 print(f"Error using LangChain: {str(e)}")
                 return {
@@ -783,6 +1113,145 @@ Your answer should be comprehensive yet focused on directly addressing the quest
             "references": []
         }
 
+async def answer_questions(analyzer, questions, model="llama3-70b-8192"):
+    """Answer several questions about the simulation logs with a single model request
+    
+    The log context is sent once for all questions instead of once per question.
+    Returns one answer dict per question, in order.
+    """
+    if len(questions) == 1:
+        return [await answer_question(analyzer, questions[0], model)]
+    
+    try:
+        await _ensure_structured_output(analyzer, model)
+        
+        prompt = build_questions_prompt(analyzer, questions)
+        
+        if USE_GROQ_DIRECT:
+            response_content, _ = await _stream_completion(
+                _async_groq_client(),
+                [
+                    {"role": "system", "content": QA_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                model
+            )
+        else:
+            response_content = (await _chat_groq(model).ainvoke(prompt)).content
+        
+        return [_postprocess_answer(answer, analyzer) for answer in _split_answers(response_content, len(questions))]
+    except Exception as e:
+        print(f"Error answering questions: {str(e)}")
+        return [{"answer": f"Error: {str(e)}", "references": []} for _ in questions]
+
+def run_batch_mode(analyzer, batch_file, model="llama3-70b-8192", output_file="batch_answers.jsonl", poll_interval=30,
+                   analysis_output="simulation.txt", analysis_json="analysis_output.json"):
+    """Answer many questions with a single Groq batch job instead of one request per question
+
+    Each line of batch_file is a JSON object with a "question" and optionally a
+    "log_file" (defaults to the log the analyzer was built from) and a "custom_id".
+    Answers are written to output_file as one JSON object per line. Other log files
+    are analyzed into analysis_output/analysis_json prefixed with the log's file stem,
+    leaving the main run's outputs untouched.
+    """
+    if not USE_GROQ_DIRECT:
+        print("Error: Batch mode requires the groq package. Please install it with: pip install groq")
+        return False
+    
+    # Collect the (log_file, question) rows
+    with open(batch_file, 'r') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    if not rows:
+        print(f"No questions found in {batch_file}")
+        return False
+    
+    default_log = getattr(analyzer, 'log_file_path', None) or analyzer.log_file
+    analyzers = {default_log: analyzer}
+    
+    # Build one request line per question in the batch input format
+    requests_jsonl = []
+    rows_by_id = {}
+    for i, row in enumerate(rows):
+        custom_id = str(row.get("custom_id", f"question-{i}"))
+        log_file = row.get("log_file", default_log)
+        if log_file not in analyzers:
+            analysis_result, log_analyzer = run_analyzer(
+                log_file,
+                _per_log_path(analysis_output, log_file),
+                _per_log_path(analysis_json, log_file),
+                model
+            )
+            if analysis_result is None:
+                print(f"Skipping question {custom_id}: failed to analyze {log_file}")
+                continue
+            analyzers[log_file] = log_analyzer
+        
+        rows_by_id[custom_id] = {"custom_id": custom_id, "log_file": log_file, "question": row["question"]}
+        requests_jsonl.append(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": QA_SYSTEM_PROMPT},
+                    {"role": "user", "content": build_question_prompt(analyzers[log_file], row["question"])}
+                ],
+                "temperature": 0.2,
+                "max_tokens": 1500,
+                "top_p": 0.95
+            }
+        }))
+    
+    if not requests_jsonl:
+        print("No questions could be prepared for the batch job.")
+        return False
+    
+    # Upload the input file and submit the batch job
+    client = _groq_client()
+    batch_input = client.files.create(
+        file=("batch_questions.jsonl", "\n".join(requests_jsonl).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_input.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} with {len(requests_jsonl)} questions")
+    
+    # Poll until the batch reaches a terminal state
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        print(f"Batch {batch.id} status: {batch.status}")
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"Batch {batch.id} did not complete successfully (status: {batch.status})")
+        return False
+    
+    # Match responses back to their questions by custom_id
+    output = client.files.content(batch.output_file_id)
+    for line in output.text().splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        row = rows_by_id.get(result.get("custom_id"))
+        if row is None:
+            continue
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            row["answer"] = f"Error using AI model: {result.get('error') or response.get('body')}"
+        else:
+            row.update(_postprocess_answer(response["body"]["choices"][0]["message"]["content"], analyzers[row["log_file"]]))
+    
+    with open(output_file, 'w') as f:
+        for row in rows_by_id.values():
+            f.write(json.dumps(row) + "\n")
+    
+    print(f"✓ Batch answers saved to: {output_file}")
+    return True
+
 def main():
     """Main function to run the analyzer"""
     parser = argparse.ArgumentParser(description="Run analysis on quantum-classical network simulation logs")
@@ -791,9 +1260,16 @@ def main():
     parser.add_argument("--json", default="analysis_output.json", help="Path to the JSON output file")
     parser.add_argument("--model", default="llama3-70b-8192", choices=["llama3-8b-8192", "llama3-70b-8192", "mixtral-8x7b-32768"], help="Groq model to use")
     parser.add_argument("--mode", default="qa", choices=["analyzer", "qa"], help="Mode to run in")
-    parser.add_argument("--question", help="Question to ask in QA mode")
+    parser.add_argument("--question", action="append", help="Question to ask in QA mode (repeat to ask several in one request)")
+    parser.add_argument("--batch", help="Path to a JSONL file of questions to answer with a single Groq batch job")
+    parser.add_argument("--batch-output", default="batch_answers.jsonl", help="Path to the JSONL file for batch answers")
+    parser.add_argument("--batch-dir", help="Analyze every JSON log file in this directory in parallel (no Q&A)")
     args = parser.parse_args()
     
+    # Analyze a whole directory of logs without entering Q&A mode
+    if args.batch_dir:
+        return 0 if run_batch_analysis(args.batch_dir, args.output, args.json, args.model) else 1
+    
     # Check if log file exists
     if not os.path.exists(args.log):
         print(f"Error: Log file '{args.log}' not found. Please check the file path.")
@@ -801,7 +1277,7 @@ def main():
     
     # Run the analyzer
     try:
-        analysis_result = run_analyzer(args.log, args.output, args.json, args.model)
+        analysis_result, analyzer = run_analyzer(args.log, args.output, args.json, args.model)
         
         if analysis_result is None:
             print("Analysis failed. Please check the logs for details.")
@@ -811,17 +1287,20 @@ def main():
         print("ANALYSIS COMPLETED SUCCESSFULLY")
         print("======================================================================")
         
-        # Store the analyzer object for QA mode
-        analyzer = SimulationLogAnalyzer(args.log)
-        analyzer.structured_output = analysis_result
-        
         # Handle Q&A modes
-        if args.question:
-            # Single question mode
-            print(f"\nAnswering question: {args.question}")
-            result = answer_question(analyzer, args.question, args.model)
-            print("\nAnswer:")
-            print(result)
+        if args.batch:
+            # Non-interactive batch mode
+            print(f"\nAnswering questions from: {args.batch}")
+            if not run_batch_mode(analyzer, args.batch, args.model, args.batch_output,
+                                  analysis_output=args.output, analysis_json=args.json):
+                return 1
+        elif args.question:
+            # Question mode; several questions share one request
+            results = asyncio.run(answer_questions(analyzer, args.question, args.model))
+            for question, result in zip(args.question, results):
+                print(f"\nQuestion: {question}")
+                print("Answer:")
+                print(result)
         elif args.mode == "qa":
             print("\n\nEntering Q&A session...")
             print("You can ask questions about the simulation log analysis.")
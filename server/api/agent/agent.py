@@ -1,14 +1,19 @@
+import asyncio
 import traceback
-from typing import Any, Dict
-from fastapi import APIRouter, Body
-from ai_agent.src.consts.agent_type import AgentType
+from fastapi import APIRouter
 from fastapi import HTTPException
 
 from ai_agent.src.consts.workflow_type import WorkflowType
-from ai_agent.src.orchestration.coordinator import Coordinator
+from ai_agent.src.orchestration.coordinator import get_coordinator
 from data.models.conversation.conversation_model import MessageRole
 from data.models.conversation.conversation_ops import add_chat_message, create_conversation_metadata, get_conversation_metadata
-from server.api.agent.agent_request import AgentInteractionRequest, AgentRouterRequest
+from server.api.agent.agent_request import (
+    AgentMessage,
+    AgentRouterRequest,
+    LogSummaryRequest,
+    SynthesizeTopologyRequest,
+    TopologyOptimizeRequest,
+)
 from server.api.agent.summarize import handle_summary_request
 from server.api.agent.topology_agent_api import handle_topology_design
 
@@ -19,32 +24,33 @@ agent_router = APIRouter(
 )
 
 
-async def handle_routing_request(message_dict: Dict[str, Any]):
-    message = AgentRouterRequest(**message_dict)
-    agent_coordinator = Coordinator()
+async def handle_routing_request(message: AgentRouterRequest):
+    agent_coordinator = get_coordinator()
     response = await agent_coordinator.execute_workflow(WorkflowType.ROUTING, message.model_dump())
     return response
 
+def _record_user_message(message: AgentMessage) -> None:
+    conversation_metadata = get_conversation_metadata(message.conversation_id)
+    if conversation_metadata is None:
+        conversation_metadata = create_conversation_metadata(message.conversation_id)
+
+    add_chat_message(conversation_metadata.pk, MessageRole.USER, getattr(message, 'user_query', None))
+
 agent_to_handler = {
-    AgentType.LOG_SUMMARIZER.value: handle_summary_request,
-    AgentType.ORCHESTRATOR.value: handle_routing_request,
-    AgentType.TOPOLOGY_DESIGNER.value: handle_topology_design
+    LogSummaryRequest: handle_summary_request,
+    AgentRouterRequest: handle_routing_request,
+    SynthesizeTopologyRequest: handle_topology_design,
+    TopologyOptimizeRequest: handle_topology_design,
 }
 
 @agent_router.post("/message")
-async def get_agent_message(message: Dict[str, Any] = Body()):
+async def get_agent_message(message: AgentMessage):
     try:
-        validated_message = AgentInteractionRequest(**message)
-        conversation_metadata = get_conversation_metadata(validated_message.conversation_id)
-        if conversation_metadata is None:
-            conversation_metadata = create_conversation_metadata(validated_message.conversation_id)
-
-        add_chat_message(conversation_metadata.pk, MessageRole.USER, message.get('user_query'))
-        response = await agent_to_handler[message['agent_id']](message)
+        # The Redis conversation calls are blocking; keep them off the event loop
+        await asyncio.to_thread(_record_user_message, message)
+        response = await agent_to_handler[type(message)](message)
 
         return response
-    except KeyError  as e:
-        raise HTTPException(status_code=400, detail=f"Invalid agent type: {message.get('agent_id', 'INVALID_AGENT_ID')}")
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -1,5 +1,5 @@
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from typing import Annotated, Any, Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Discriminator, Tag
 
 from ai_agent.src.agents.base.enums import AgentTaskType
 from ai_agent.src.agents.topology_agent.structure import SynthesisTopologyRequest
@@ -7,6 +7,8 @@ from ai_agent.src.consts.agent_type import AgentType
 
 
 class AgentInteractionRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     agent_id: AgentType
     task_id: Optional[AgentTaskType] = None
     conversation_id: str
@@ -26,3 +28,30 @@ class TopologyOptimizeRequest(AgentInteractionRequest):
 
 class SynthesizeTopologyRequest(AgentInteractionRequest, SynthesisTopologyRequest):
     pass
+
+
+def _agent_message_tag(message: Any) -> Optional[str]:
+    """Pick the AgentMessage variant from agent_id, and task_id for the topology designer."""
+    if isinstance(message, dict):
+        agent_id, task_id = message.get('agent_id'), message.get('task_id')
+    else:
+        agent_id, task_id = getattr(message, 'agent_id', None), getattr(message, 'task_id', None)
+    agent_id = getattr(agent_id, 'value', agent_id)
+    task_id = getattr(task_id, 'value', task_id)
+
+    if agent_id == AgentType.TOPOLOGY_DESIGNER.value:
+        return 'synthesize_topology' if task_id == AgentTaskType.SYNTHESIZE_TOPOLOGY.value else 'optimize_topology'
+    return agent_id
+
+
+# Body of /agent/message, validated once straight into the request model of its agent
+AgentMessage = Annotated[
+    Union[
+        Annotated[LogSummaryRequest, Tag(AgentType.LOG_SUMMARIZER.value)],
+        Annotated[AgentRouterRequest, Tag(AgentType.ORCHESTRATOR.value)],
+        Annotated[SynthesizeTopologyRequest, Tag('synthesize_topology')],
+        Annotated[TopologyOptimizeRequest, Tag('optimize_topology')],
+    ],
+    Discriminator(_agent_message_tag),
+]
+
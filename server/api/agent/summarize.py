@@ -1,13 +1,11 @@
-from typing import Any, Dict
 from ai_agent.src.agents.base.enums import AgentTaskType
 from ai_agent.src.consts.workflow_type import WorkflowType
-from ai_agent.src.orchestration.coordinator import Coordinator
+from ai_agent.src.orchestration.coordinator import get_coordinator
 from server.api.agent.agent_request import LogSummaryRequest
 
 
-async def handle_summary_request(message_dict: Dict[str, Any] ):
-    message = LogSummaryRequest(**message_dict)
-    agent_coordinator = Coordinator()
+async def handle_summary_request(message: LogSummaryRequest):
+    agent_coordinator = get_coordinator()
     
     response = await agent_coordinator.execute_workflow(
         WorkflowType.LOG_SUMMARIZATION,
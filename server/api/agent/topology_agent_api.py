@@ -1,18 +1,13 @@
-from typing import Any, Dict
+from typing import Union
 from ai_agent.src.agents.base.enums import AgentTaskType
 from ai_agent.src.consts.workflow_type import WorkflowType
-from ai_agent.src.orchestration.coordinator import Coordinator
+from ai_agent.src.orchestration.coordinator import get_coordinator
 from data.models.topology.world_model import save_world_to_redis
 from server.api.agent.agent_request import SynthesizeTopologyRequest, TopologyOptimizeRequest
 
 
-async def handle_topology_design(message_dict: Dict[str, Any]):
-    if (message_dict.get('task_id') == AgentTaskType.SYNTHESIZE_TOPOLOGY.value):
-        message = SynthesizeTopologyRequest(**message_dict)
-    else:
-        message = TopologyOptimizeRequest(**message_dict)
-    
-    agent_coordinator = Coordinator()
+async def handle_topology_design(message: Union[SynthesizeTopologyRequest, TopologyOptimizeRequest]):
+    agent_coordinator = get_coordinator()
     
     response = await agent_coordinator.execute_workflow(
         WorkflowType.TOPOLOGY_WORKFLOW,
@@ -1,67 +1,98 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pprint import pprint
+import logging
+import queue
+import sys
 import threading
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List
 import traceback
 
-from core.base_classes import World
+from core.base_classes import Node, World
 from core.event import Event
-from data.embedding.embedding_util import EmbeddingUtil
-from data.models.simulation.log_model import add_log_entry
+from data.embedding.embedding_util import CachedEmbeddingUtil
+from data.models.simulation.log_model import LogBuffer
 from data.models.simulation.simulation_model import (
     SimulationModal,
     SimulationStatus,
     save_simulation,
-    update_simulation_status,
 )
 from data.models.topology.world_model import WorldModal
 from json_parser import simulate_from_json
 from server.socket_server.socket_server import ConnectionManager
 
+# Log entries are saved (and embedded) in batches of up to LOG_BATCH_SIZE, or
+# whatever has queued up within LOG_FLUSH_INTERVAL seconds of the first entry
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 0.25
+
+# Queued to shut down the log worker
+_LOG_WORKER_STOP = object()
+
+# Simulation field updates within this many seconds are written to Redis together
+SIM_SAVE_DEBOUNCE = 0.1
+
+# Events emitted within this many seconds are sent to clients as one batch (~60Hz)
+EVENT_FLUSH_INTERVAL = 1 / 60
+
+logger = logging.getLogger(__name__)
+
 
 class SimulationManager:
-    _instance: Optional["SimulationManager"] = None
+    """Runs one simulation at a time; use get_manager() for the shared instance"""
     simulation_world: World = None
 
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(SimulationManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
     def __init__(self):
-        if self._initialized:
-            return
-
-        self._initialized = True
         self.is_running = False
         self.socket_conn = ConnectionManager()
         self.current_simulation = None
         self.simulation_data: SimulationModal = None
+        self._sim_save_lock = threading.Lock()
+        self._sim_save_timer: Optional[threading.Timer] = None
         self.main_event_loop = None
-        self.embedding_util = EmbeddingUtil(embedding_provider="openai")
+        self._node_by_name: Dict[str, Node] = {}
+        # Set on the main loop once the world's game loop exits or stop() is called
+        self._world_done: Optional[asyncio.Event] = None
+        self._simulation_task: Optional[asyncio.Task] = None
+        self.embedding_util = CachedEmbeddingUtil(embedding_provider="openai")
+        self._log_buffer = LogBuffer()
+        self._log_queue: queue.Queue = queue.Queue()
+        self._log_thread: Optional[threading.Thread] = None
+        self._pending_events: List[Dict[str, Any]] = []
+        self._pending_events_lock = threading.Lock()
+        self._flush_scheduled = False
+        # Set on the main loop when events are pending; awaited by the broadcast consumer
+        self._events_ready: Optional[asyncio.Event] = None
+        self._broadcast_task: Optional[asyncio.Task] = None
+        # Builds worlds (CPU-bound) off the event loop, one at a time
+        self._simulation_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="simulation"
+        )
 
     @classmethod
     def get_instance(cls) -> "SimulationManager":
         """Get or create the singleton instance"""
-        if cls._instance is None:
-            return cls()
-        return cls._instance
+        return get_manager()
 
     @classmethod
     def destroy_instance(cls) -> None:
         """Reset the singleton instance"""
-        if cls._instance is not None:
-            cls._instance.stop()
-            cls._instance = None
+        global _manager
+        with _manager_lock:
+            manager, _manager = _manager, None
+        if manager is not None:
+            manager.stop()
 
-    def start_simulation(self, network: WorldModal) -> bool:
+    async def start_simulation(self, network: WorldModal) -> bool:
         if self.is_running:
             return False
 
         try:
             self.is_running = True
+            # Write out the previous simulation before replacing it; Redis
+            # writes run in a worker thread so the event loop stays free
+            await asyncio.to_thread(self._flush_simulation_save)
             self.simulation_data = SimulationModal(
                 world_id=network.pk,
                 name=network.name,
@@ -71,121 +102,159 @@ class SimulationManager:
                 configuration=network,
                 metrics=None,
             )
-            self.save_simulation = save_simulation(self.simulation_data)
-            try:
-                self.main_event_loop = asyncio.get_running_loop()
-                print(f"Captured main event loop: {self.main_event_loop}")
-            except RuntimeError:
-                print(
-                    "CRITICAL WARNING: Could not get running loop when starting simulation. "
-                    "Ensure start_simulation is called from an async context (e.g., await manager.start_simulation). "
-                    "Event broadcasting will likely fail."
-                )
-                self.main_event_loop = None  # Ensure it's None if failed
+            self.save_simulation = await asyncio.to_thread(
+                save_simulation, self.simulation_data
+            )
+            self._start_log_worker()
+            self.main_event_loop = asyncio.get_running_loop()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Captured main event loop: %s", self.main_event_loop)
+            self._start_broadcast_consumer()
             # Start the simulation process
             self._run_simulation(network)
 
             return self.simulation_data
 
         except Exception as e:
-            self.emit_event(
-                "simulation_error",
-                {
-                    "message": f"Error starting simulation: {str(e)}",
-                    "traceback": traceback.format_exc(),
-                },
-            )
+            # The single error boundary for starting; the route reports the failure
+            self._handle_error(e)
             raise
 
     def on_update(self, event: Event) -> None:
-        self.emit_event("simulation_event", event)
-        log_entry = add_log_entry(
+        # Serialize the event once for both the broadcast and the log entry
+        event_dict = event.to_dict()
+        self.emit_event("simulation_event", event_dict)
+        node = event.node
+        log_entry = self._log_buffer.append(
             {
                 "simulation_id": self.simulation_data.pk,
                 "timestamp": datetime.now(),
                 "level": event.log_level,
-                "component": event.node.name,
-                "entity_type": getattr(event.node, "type", None),
-                "details": event.to_dict(),
+                "component": node.name,
+                "entity_type": getattr(node, "type", None),
+                "details": event_dict,
             }
         )
-        self.embedding_util.embed_and_store_log(log_entry)
+        # Saved (and embedded) in batches by the log worker, off the simulation thread
+        self._log_queue.put_nowait(log_entry)
+
+    def _start_log_worker(self) -> None:
+        if self._log_thread is not None and self._log_thread.is_alive():
+            return
+        self._log_thread = threading.Thread(
+            target=self._log_worker, name="log-worker", daemon=True
+        )
+        self._log_thread.start()
+
+    def _log_worker(self) -> None:
+        """Save and embed queued log entries in batches until _LOG_WORKER_STOP arrives"""
+        stopping = False
+        while not stopping:
+            item = self._log_queue.get()
+            if item is _LOG_WORKER_STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            while len(batch) < LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._log_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _LOG_WORKER_STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._log_buffer.flush()
+            except Exception as e:
+                logger.exception("Error saving %d log entries: %s", len(batch), e)
+                continue
+
+            try:
+                self.embedding_util.embed_and_store_logs_batch(batch)
+            except Exception as e:
+                logger.exception("Error embedding %d log entries: %s", len(batch), e)
 
     def _run_simulation(self, topology_data: WorldModal) -> None:
         """
         Run the actual simulation process
         This would be where your simulation logic lives
         """
+        # Errors here propagate to start_simulation's error boundary
+        # Run simulation in background, as a task on the main loop
+        self._world_done = asyncio.Event()
+        self._simulation_task = self.main_event_loop.create_task(
+            self._simulate(topology_data)
+        )
+
+    async def _simulate(self, topology_data: WorldModal) -> None:
+        loop = asyncio.get_running_loop()
+        world_done = self._world_done
         try:
-            import time
-            from threading import Thread
+            self.emit_event(
+                "simulation_started", {"time": datetime.now().timestamp()}
+            )
 
-            def simulation_worker():
-                try:
-                    self.emit_event(
-                        "simulation_started", {"time": datetime.now().timestamp()}
-                    )
-
-                    # Mark as running
-                    self.simulation_data.status = SimulationStatus.RUNNING
-                    update_simulation_status(
-                        self.simulation_data.pk, SimulationStatus.RUNNING
-                    )
-                    self.simulation_world = simulate_from_json(
-                        topology_data.model_dump(), self.on_update
-                    )
-
-                    while self.simulation_world.is_running:
-                        time.sleep(5)
-
-                    self.emit_event(
-                        "simulation_completed",
-                        {"results": self.simulation_data["results"]},
-                    )
-                    self.simulation_data.status = SimulationStatus.COMPLETED
-                    update_simulation_status(
-                        self.simulation_data.pk, SimulationStatus.COMPLETED
-                    )
-
-                except Exception as e:
-                    self._handle_error(e)
-                    self.simulation_data.status = SimulationStatus.FAILED
-                    update_simulation_status(
-                        self.simulation_data.pk, SimulationStatus.FAILED
-                    )
-
-                finally:
-                    # Reset run state if this wasn't from an external stop
-                    if self.is_running:
-                        self.is_running = False
-
-            # Run simulation in background
-            Thread(target=simulation_worker).start()
+            # Mark as running
+            self._set_status(SimulationStatus.RUNNING)
+
+            # Building the world is CPU-bound; only this step leaves the event loop
+            self.simulation_world = await loop.run_in_executor(
+                self._simulation_executor,
+                simulate_from_json,
+                topology_data.model_dump(),
+                self.on_update,
+            )
+            self._node_by_name = {
+                node.name: node
+                for network in self.simulation_world.networks
+                for node in network.nodes
+            }
+
+            # Wait for the world's game loop (its own thread) to exit, or for stop()
+            self.simulation_world.on_stop_callbacks.append(
+                lambda: loop.call_soon_threadsafe(world_done.set)
+            )
+            if not self.simulation_world.is_running():
+                world_done.set()
+            await world_done.wait()
+
+            self.emit_event(
+                "simulation_completed",
+                {"results": self.simulation_data.results},
+            )
+            self._set_status(SimulationStatus.COMPLETED)
 
         except Exception as e:
+            # Marks the simulation FAILED
             self._handle_error(e)
 
+        finally:
+            # Reset run state if this wasn't from an external stop
+            if self.is_running:
+                self.is_running = False
+
     def send_message_command(
         self, from_node_name: str, to_node_name: str, message: str
     ):
-        from_node = to_node = None
-        for network in self.simulation_world.networks:
-            for node in network.nodes:
-                if node.name == from_node_name:
-                    from_node = node
-                    continue
-                if node.name == to_node_name:
-                    to_node = node
-                    continue
+        from_node = self._node_by_name.get(from_node_name)
+        to_node = self._node_by_name.get(to_node_name)
 
         if not (from_node and to_node):
-            print(from_node, to_node)
+            logger.warning(
+                "Nodes not found for sending message: %s -> %s", from_node_name, to_node_name
+            )
             self.emit_event(
                 "simulation_error", {"error": "Nodes not found for sending message"}
             )
             return
 
-        print("Send Message B/W ", from_node, " And ", to_node)
+        logger.info("Send message between %s and %s", from_node, to_node)
 
         from_node.send_data(message, to_node)
 
@@ -195,81 +264,181 @@ class SimulationManager:
             return
 
         self.is_running = False
+        if self._world_done is not None and self.main_event_loop is not None:
+            self.main_event_loop.call_soon_threadsafe(self._world_done.set)
+
+        # Flush the remaining log entries and shut down the log worker
+        if self._log_thread is not None:
+            self._log_queue.put(_LOG_WORKER_STOP)
+            self._log_thread = None
 
         if self.current_simulation is not None:
             # Add logic to safely stop your simulation
             # self.current_simulation.stop()
             self.current_simulation = None
 
-        self.simulation_data.status = SimulationStatus.COMPLETED
-        update_simulation_status(self.simulation_data.pk, SimulationStatus.COMPLETED)
+        self._set_status(SimulationStatus.COMPLETED)
         self.simulation_world.stop()
+        # Commands must not resolve nodes of a stopped world
+        self._node_by_name = {}
 
     def get_status(self) -> Dict[str, Any]:
         """Get current simulation status"""
+        simulation_data = self.simulation_data
+        if simulation_data is None:
+            return {
+                "is_running": self.is_running,
+                "progress": 0,
+                "status": "idle",
+                "results": None,
+                "error": None,
+            }
         return {
             "is_running": self.is_running,
-            "progress": self.simulation_data.get("progress", 0),
-            "status": self.simulation_data.get("status", "idle"),
-            "results": self.simulation_data.get("results"),
-            "error": self.simulation_data.get("error"),
+            "progress": simulation_data.progress,
+            "status": simulation_data.status,
+            "results": simulation_data.results,
+            "error": simulation_data.error,
         }
 
+    def _update_sim_field(self, **fields: Any) -> None:
+        """
+        Set fields on simulation_data and schedule a debounced Redis save, so
+        updates arriving within SIM_SAVE_DEBOUNCE share a single write.
+        """
+        for name, value in fields.items():
+            setattr(self.simulation_data, name, value)
+
+        with self._sim_save_lock:
+            if self._sim_save_timer is not None:
+                return
+            self._sim_save_timer = threading.Timer(
+                SIM_SAVE_DEBOUNCE, self._save_simulation_data
+            )
+            self._sim_save_timer.daemon = True
+            self._sim_save_timer.start()
+
+    def _set_status(self, status: SimulationStatus) -> None:
+        """Update the status, stamping start/end times as update_simulation_status does"""
+        fields: Dict[str, Any] = {"status": status}
+        if status == SimulationStatus.RUNNING and not self.simulation_data.start_time:
+            fields["start_time"] = datetime.now()
+        elif status in (
+            SimulationStatus.COMPLETED,
+            SimulationStatus.FAILED,
+            SimulationStatus.CANCELLED,
+        ):
+            fields["end_time"] = datetime.now()
+        self._update_sim_field(**fields)
+
+    def _save_simulation_data(self) -> None:
+        with self._sim_save_lock:
+            self._sim_save_timer = None
+
+        simulation_data = self.simulation_data
+        try:
+            simulation_data.last_updated = datetime.now()
+            simulation_data.save()
+        except Exception as e:
+            logger.error("Error saving simulation %s: %s", simulation_data.pk, e)
+
+    def _flush_simulation_save(self) -> None:
+        """Write a pending debounced save immediately"""
+        with self._sim_save_lock:
+            timer, self._sim_save_timer = self._sim_save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self._save_simulation_data()
+
     def emit_event(self, event: str, data: Dict[str, Any]) -> None:
         """
-        Emit event to connected clients via Socket using run_coroutine_threadsafe.
+        Queue an event for the broadcast consumer running on the main loop.
         This method is designed to be called safely FROM A WORKER THREAD.
 
         Args:
             event: Event name
-            data: Event data
+            data: Event data, already converted to plain dicts/lists
         """
         # Check if we have the connection manager and the main loop reference
         if not self.socket_conn:
-            print(
-                f"[{threading.current_thread().name}] Warning: Socket connection manager not available. Cannot emit '{event}'."
+            logger.warning(
+                "Socket connection manager not available. Cannot emit '%s'.", event
             )
             return
-        if not self.main_event_loop or not self.main_event_loop.is_running():
-            print(
-                f"[{threading.current_thread().name}] Warning: Main event loop not available or not running. Cannot emit '{event}'."
-            )
+        # Nobody is listening (e.g. headless runs); skip queueing and the loop wakeup
+        if not self.socket_conn.client_count:
             return
-
-        try:
-            if hasattr(data, "to_dict"):
-                data = data.to_dict()
-        except Exception as e:
-            print(
-                f"[{threading.current_thread().name}] Error serializing data for event '{event}': {e}"
+        if (
+            not self.main_event_loop
+            or not self.main_event_loop.is_running()
+            or self._events_ready is None
+        ):
+            logger.warning(
+                "Main event loop not available or not running. Cannot emit '%s'.", event
             )
-            pprint(data)
             return
 
-        coro_to_run = self.socket_conn.broadcast(dict(event=event, data=data))
-        future = asyncio.run_coroutine_threadsafe(coro_to_run, self.main_event_loop)
+        # Queue the event; only the first event of a batch wakes the main loop
+        with self._pending_events_lock:
+            self._pending_events.append(dict(event=event, data=data))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
 
-        print(
-            f"[{threading.current_thread().name}] Submitted broadcast for event '{event}' to main loop."
-        )
+        self.main_event_loop.call_soon_threadsafe(self._events_ready.set)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Woke broadcast consumer for event '%s'.", event)
+
+    def _start_broadcast_consumer(self) -> None:
+        """Start the long-running broadcast task on the main loop, once per loop"""
+        if self._broadcast_task is not None and not self._broadcast_task.done():
+            return
+        self._events_ready = asyncio.Event()
+        self._broadcast_task = self.main_event_loop.create_task(self._broadcast_consumer())
+
+    async def _broadcast_consumer(self) -> None:
+        """Broadcast pending events as one message per EVENT_FLUSH_INTERVAL tick"""
+        while True:
+            await self._events_ready.wait()
+            await asyncio.sleep(EVENT_FLUSH_INTERVAL)
+            self._events_ready.clear()
+            with self._pending_events_lock:
+                events, self._pending_events = self._pending_events, []
+                self._flush_scheduled = False
+
+            if not events:
+                continue
+            try:
+                if len(events) == 1:
+                    await self.socket_conn.broadcast(events[0])
+                else:
+                    await self.socket_conn.broadcast({"batch": events})
+            except Exception as e:
+                logger.error("Error broadcasting %d events: %s", len(events), e)
 
     def _handle_error(self, error: Exception) -> None:
         """
-        Handle simulation errors
+        Handle simulation errors: record them on the simulation, reset the run
+        state and notify clients. Does not re-raise.
 
         Args:
             error: The exception that occurred
         """
-        error_info = {"message": str(error), "traceback": traceback.format_exc()}
-
-        self.simulation_data["status"] = "error"
-        self.simulation_data["error"] = error_info
+        # Only format a traceback when there is an active exception to describe
+        if sys.exc_info()[0] is not None:
+            formatted_traceback = traceback.format_exc()
+        else:
+            formatted_traceback = "".join(traceback.format_exception(error))
+        error_info = {"message": str(error), "traceback": formatted_traceback}
+
+        if self.simulation_data is not None:
+            self._update_sim_field(error=error_info)
+            self._set_status(SimulationStatus.FAILED)
         self.is_running = False
 
         self.emit_event("simulation_error", error_info)
 
-        raise error
-
     def _on_progress_update(self, progress: int, message: str) -> None:
         """
         Handle progress updates from the simulation
@@ -278,7 +447,26 @@ class SimulationManager:
             progress: Progress percentage (0-100)
             message: Progress message
         """
-        self.simulation_data["progress"] = progress
+        self._update_sim_field(progress=progress)
         self.emit_event(
             "simulation_progress", {"progress": progress, "message": message}
         )
+
+
+_manager: Optional[SimulationManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> SimulationManager:
+    """Return the shared SimulationManager, creating it on first use.
+
+    Double-checked locking: once created, callers only read a module global.
+    """
+    global _manager
+    manager = _manager
+    if manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = SimulationManager()
+            manager = _manager
+    return manager
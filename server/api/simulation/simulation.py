@@ -1,34 +1,48 @@
-from fastapi import APIRouter, HTTPException, status, Body
-from typing import Dict, Any
+import asyncio
 
-from data.models.topology.world_model import get_topology_from_redis
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+
+from data.models.topology.world_model import get_cached_topology
 from server.api.simulation.manager import SimulationManager
+from server.api.simulation.simulation_request import SimulationMessageRequest
 
 simulation_router = APIRouter(
     prefix="/simulation",
     tags=["Simulation"]
 )
 
-try:
-    manager = SimulationManager.get_instance()
-except Exception as e:
-    print(f"CRITICAL: Failed to initialize SimulationManager: {e}")
-    manager = None
+# Fixed response bodies, encoded once; returning a Response skips FastAPI's encoding
+_MESSAGE_SENT = b'{"message":"Message command sent"}'
+_SIMULATION_STOPPED = b'{"message":"Simulation Stopped"}'
+_STATUS_RUNNING = b'{"is_running":true}'
+_STATUS_IDLE = b'{"is_running":false}'
+# Same body FastAPI's HTTPException handler would produce
+_NOT_RUNNING_ERROR = b'{"detail":"Simulation not running"}'
+
+
+async def require_manager(request: Request) -> SimulationManager:
+    """Route dependency providing the SimulationManager created in the app lifespan,
+    or a 503 if it failed to initialize.
+
+    Async so FastAPI resolves it on the event loop instead of the threadpool.
+    """
+    manager = getattr(request.app.state, "sim_manager", None)
+    if manager is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Simulation Manager not initialized")
+    return manager
 
 
 @simulation_router.get(
     '/status/',
     summary="Get current simulation status"
 )
-async def get_simulation_status():
+async def get_simulation_status(manager: SimulationManager = Depends(require_manager)):
     """
     Returns whether the simulation managed by the SimulationManager is currently running.
     """
-    if manager is None:
-         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Simulation Manager not initialized")
-    return {
-        'is_running': manager.is_running
-    }
+    body = _STATUS_RUNNING if manager.is_running else _STATUS_IDLE
+    return Response(content=body, media_type="application/json")
 
 @simulation_router.post(
     '/message/',
@@ -36,32 +50,31 @@ async def get_simulation_status():
     summary="Send a message/command to the running simulation"
 )
 async def send_simulation_message(
-    message_data: Dict[str, Any] = Body(...)
+    message_data: SimulationMessageRequest,
+    manager: SimulationManager = Depends(require_manager),
 ):
     """
-    Sends a command (provided as JSON in the request body)
-    to the simulation via the SimulationManager.
+    Sends a message between two nodes of the running simulation via the
+    SimulationManager. A malformed body is rejected with a 422 before this runs.
     Requires the simulation to be running.
     """
-    if manager is None:
-         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Simulation Manager not initialized")
-
     if not manager.is_running:
-        # Use HTTPException for errors - more standard in FastAPI
-        raise HTTPException(
+        return Response(
+            content=_NOT_RUNNING_ERROR,
+            media_type="application/json",
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Simulation Not Running"
         )
 
     try:
-        manager.send_message_command(**message_data)
-
-        return {"message": "Message command sent"}
-    except TypeError as e:
-         raise HTTPException(
-              status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-              detail=f"Invalid message data format: {e}"
-         )
+        # Runs against the simulation in a worker thread, keeping the event loop free
+        await asyncio.to_thread(
+            manager.send_message_command,
+            message_data.from_node_name,
+            message_data.to_node_name,
+            message_data.message,
+        )
+
+        return Response(content=_MESSAGE_SENT, media_type="application/json")
     except Exception as e:
         print(f"Error sending simulation message: {e}")
         raise HTTPException(
@@ -74,22 +87,20 @@ async def send_simulation_message(
     "/",
     summary="Stop the currently running simulation"
 )
-async def stop_simulation():
+async def stop_simulation(manager: SimulationManager = Depends(require_manager)):
     """
     Stops the simulation if it is currently running.
     """
-    if manager is None:
-         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Simulation Manager not initialized")
-
     if not manager.is_running:
-        raise HTTPException(
+        return Response(
+            content=_NOT_RUNNING_ERROR,
+            media_type="application/json",
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Simulation not running"
         )
 
     try:
-        manager.stop()
-        return {"message": "Simulation Stopped"}
+        await asyncio.to_thread(manager.stop)
+        return Response(content=_SIMULATION_STOPPED, media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -97,9 +108,8 @@ async def stop_simulation():
         )
 
 
-@simulation_router.api_route(
+@simulation_router.post(
     "/{topology_id}",
-    methods=["GET", "POST"],
     status_code=status.HTTP_201_CREATED,
     summary="Start the simulation using the network file",
     responses={
@@ -108,18 +118,17 @@ async def stop_simulation():
         status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Simulation Manager not initialized"}
     }
 )
-async def execute_simulation(topology_id:str):
+async def execute_simulation(
+    topology_id: str, manager: SimulationManager = Depends(require_manager)
+):
     """
     Starts the simulation using the predefined 'network.json' file.
     Returns 201 Created on success.
     Returns 409 Conflict if the simulation is already running.
     Returns 500 Internal Server Error if starting fails.
-    Accessible via both GET and POST requests.
     """
-    if manager is None:
-         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Simulation Manager not initialized")
-    
-    world = get_topology_from_redis(topology_id)
+    # A cache miss or revalidation reads Redis, so keep it off the event loop
+    world = await asyncio.to_thread(get_cached_topology, topology_id)
 
     if not world:
         raise HTTPException(
@@ -128,7 +137,7 @@ async def execute_simulation(topology_id:str):
         )
 
     try:
-        simulation_started = manager.start_simulation(world)
+        simulation_started = await manager.start_simulation(world)
 
         if not simulation_started:
             raise HTTPException(
@@ -136,7 +145,9 @@ async def execute_simulation(topology_id:str):
                 detail="Simulation already running"
             )
 
-        return simulation_started
+        return ORJSONResponse(
+            simulation_started.model_dump(), status_code=status.HTTP_201_CREATED
+        )
 
     except Exception as e:
         print(f"Error starting simulation: {e}")
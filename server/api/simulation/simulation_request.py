@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class SimulationMessageRequest(BaseModel):
+    from_node_name: str
+    to_node_name: str
+    message: str
@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import aiofiles  # Library for async file operations
 from fastapi import APIRouter, Body, HTTPException, Response, Request, status
 from typing import Any, List, Optional
 
@@ -8,7 +8,7 @@ from pydantic import ValidationError
 from data.models.topology.world_model import (
     WorldModal,
     get_all_topologies_from_redis,
-    get_topology_from_redis,
+    get_cached_topology,
     save_world_to_redis,
     update_world_in_redis,
 )  # For type hinting the request body
@@ -38,10 +38,13 @@ async def update_topology(
     """
 
     try:
+        # Redis writes block, so run them off the event loop
         if topology_id:
-            topology_data = update_world_in_redis(topology_id, topology_data.model_dump())
+            topology_data = await asyncio.to_thread(
+                update_world_in_redis, topology_id, topology_data.model_dump()
+            )
         else:
-            topology_data = save_world_to_redis(topology_data)
+            topology_data = await asyncio.to_thread(save_world_to_redis, topology_data)
 
         return topology_data
 
@@ -62,17 +65,19 @@ async def update_topology(
 )
 async def get_topology(topology_id: str):
     """
-    Reads the topology data from the network file asynchronously
-    and returns its content directly.
+    Returns the topology with the given id, served from the in-process
+    topology cache when it was read or written recently.
     """
     try:
-        world = get_topology_from_redis(topology_id)
+        # A cache miss or revalidation reads Redis, so keep it off the event loop
+        world = await asyncio.to_thread(get_cached_topology, topology_id)
         if not world:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Topology with id '{topology_id}' not found.",
             )
-        return world
+        # Pydantic writes the JSON in one pass, skipping jsonable_encoder's walk of the tree
+        return Response(content=world.model_dump_json(), media_type="application/json")
 
     except ValidationError as e:
         logging.exception("Validation error while retrieving topologies: %s", e)
@@ -99,7 +104,7 @@ async def list_all_topologies():
     """
     try:
         # Assuming you have a function to list all topologies
-        topologies = get_all_topologies_from_redis()
+        topologies = await asyncio.to_thread(get_all_topologies_from_redis)
         return topologies
 
     except ValidationError as e:
@@ -1,18 +1,24 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from server.socket_server.socket_server import websocket_endpoint
 
-REACT_BUILD_FOLDER = "../ui/dist"
-
 # Create a new app factory function
 def get_app(lifespan):
-    app = FastAPI(title="Network Simulator API", version="1.0.0", lifespan=lifespan)
+    # Route return values are serialized with orjson instead of the stdlib json module
+    app = FastAPI(
+        title="Network Simulator API",
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
     # CORS(app, origins='*')
     
+    # Registered before the UI catch-all mount, which would otherwise also match /ws
+    app.add_websocket_route("/ws", websocket_endpoint)
+
     # Register routes
     from server.routes import register_routes
     register_routes(app)
     
-    app.add_websocket_route("/ws", websocket_endpoint)
-    
     return app
@@ -1,9 +1,15 @@
 import os
 from fastapi import APIRouter, FastAPI, Request, Response
-# from flask import Blueprint, request, Response, Flask, send_from_directory
 from fastapi.responses import StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
+from starlette.exceptions import HTTPException as StarletteHTTPException
 import httpx
-import requests
+
+
+# Set ENABLE_AGENT=false to run without the AI agents; their modules (and the LLM
+# libraries behind them) are then never imported
+AGENT_ENABLED = os.getenv("ENABLE_AGENT", "true").lower() not in ("0", "false", "no")
 
 
 def proxy_to_live_app(app):
@@ -51,6 +57,7 @@ def proxy_to_live_app(app):
                 status_code=resp.status_code,
                 headers=response_headers,
                 media_type=resp.headers.get("content-type"), # Forward the original content type
+                background=BackgroundTask(resp.aclose), # Release the upstream connection
             )
 
         except httpx.RequestError as e:
@@ -60,29 +67,24 @@ def proxy_to_live_app(app):
             return Response(content=error_message, status_code=502) # Bad Gateway
 
 
-REACT_BUILD_FOLDER = "/home/sahil/QUANTUM/network_simulator_project/simulator_1/ui/dist"
-
-def serve_dist(app):
-    # Serve main page
-    @app.route('/', defaults={'path': ''})
-    @app.route('/<path:path>')
-    def serve(path):
-        # If path is an API route, skip handling it here
-        if path.startswith('api/'):
-            # Return None to let Flask continue to the next matching route
-            return None
-        print(os.path.join(REACT_BUILD_FOLDER, path))
-        # If path exists as a file, serve it directly
-        if path and os.path.exists(os.path.join(REACT_BUILD_FOLDER, path)):
-            return send_from_directory(REACT_BUILD_FOLDER, path)
-        
-        # Otherwise return index.html for client-side routing
-        return send_from_directory(REACT_BUILD_FOLDER, 'index.html')
-    
-    # Optional: Explicitly handle assets folder
-    @app.route('/assets/<path:path>')
-    def serve_assets(path):
-        return send_from_directory(os.path.join(REACT_BUILD_FOLDER, 'assets'), path)
+REACT_BUILD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui", "dist")
+
+
+class SPAStaticFiles(StaticFiles):
+    """StaticFiles that falls back to index.html so client-side routes resolve"""
+
+    async def get_response(self, path: str, scope):
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            if e.status_code != 404:
+                raise
+            return await super().get_response("index.html", scope)
+
+
+def serve_dist(app: FastAPI):
+    # Mounted after the API router, so /api routes still match first
+    app.mount("/", SPAStaticFiles(directory=REACT_BUILD_FOLDER, html=True), name="ui")
 
 def register_blueprints(app: FastAPI):
     # Create the main router for the /api prefix
@@ -98,8 +100,9 @@ def register_blueprints(app: FastAPI):
     from server.api.simulation.simulation import simulation_router
     api_router.include_router(simulation_router) 
 
-    from server.api.agent.agent import agent_router
-    api_router.include_router(agent_router)
+    if AGENT_ENABLED:
+        from server.api.agent.agent import agent_router
+        api_router.include_router(agent_router)
 
     from server.api.conversation.conversation_api import conversation_router
     api_router.include_router(conversation_router)
@@ -1,68 +1,99 @@
 import asyncio
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from typing import List, Dict, Any
+import logging
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+from typing import List, Any
 from utils.singleton import singleton
 
+logger = logging.getLogger(__name__)
+
+# A client that can't take a broadcast within this many seconds is dropped
+BROADCAST_SEND_TIMEOUT = 5.0
+
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _encode_default(obj: Any) -> Any:
+    """Fallback for values orjson can't encode natively (datetime, Enum and numpy are native)."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def encode_message(message: Any) -> str:
+    """Serializes a message for the wire; strings are sent as-is, anything else as JSON.
+
+    Sent as a text frame since the UI client JSON.parses event.data, which is a Blob
+    for binary frames.
+    """
+    if isinstance(message, str):
+        return message
+    return orjson.dumps(message, default=_encode_default, option=_ORJSON_OPTIONS).decode()
+
 @singleton
 class ConnectionManager:
     def __init__(self):
         # Store active WebSocket connections
         self.active_connections: List[WebSocket] = []
+        # Kept in step with active_connections so emitters can cheaply skip work with no listeners
+        self.client_count = 0
 
     async def connect(self, websocket: WebSocket):
         """Accepts a new WebSocket connection and adds it to the list."""
         await websocket.accept()
         self.active_connections.append(websocket)
+        self.client_count = len(self.active_connections)
         print(f"New connection accepted: {websocket.client}")
 
     def disconnect(self, websocket: WebSocket):
         """Removes a WebSocket connection from the list."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+            self.client_count = len(self.active_connections)
             print(f"Connection closed: {websocket.client}")
 
     async def send_personal_message(self, message: Any, websocket: WebSocket):
         """Sends a message (text or json) to a specific WebSocket."""
         try:
-            if isinstance(message, str):
-                await websocket.send_text(message)
-            else: # Assume JSON serializable dict/list etc.
-                await websocket.send_json(message)
+            await websocket.send_text(encode_message(message))
         except Exception as e:
             print(f"Error sending personal message to {websocket.client}: {e}")
 
 
     async def broadcast(self, message: Any):
         """Sends a message (text or json) to all active connections."""
-        print(f"Broadcasting message: {message}")
-        # Create tasks for sending messages concurrently
-        tasks = []
-        disconnected_clients = []
-
-        for connection in self.active_connections:
-            try:
-                if isinstance(message, str):
-                     tasks.append(connection.send_text(message))
-                else:
-                     tasks.append(connection.send_json(message))
-            except Exception as e:
-                 # Handle immediate error (less likely here, more likely during await gather)
-                 print(f"Error preparing broadcast for {connection.client}: {e}")
-                 disconnected_clients.append(connection) # Mark for removal
-
-        # Execute all send tasks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Check results for exceptions (indicating failed sends/disconnects)
-        for i, result in enumerate(results):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Broadcasting message: %s", message)
+        # Serialize once for all connections instead of once per send_json
+        text = encode_message(message)
+
+        # Snapshot the connections so results line up even if the list changes while sending
+        connections = list(self.active_connections)
+
+        # Send to every client concurrently; a slow client times out instead of holding up the rest
+        results = await asyncio.gather(
+            *(asyncio.wait_for(connection.send_text(text), BROADCAST_SEND_TIMEOUT) for connection in connections),
+            return_exceptions=True,
+        )
+
+        # Remove clients that failed, timed out or disconnected during broadcast
+        dropped = []
+        for connection, result in zip(connections, results):
             if isinstance(result, Exception):
-                connection = self.active_connections[i] # Find corresponding connection
-                print(f"Error broadcasting to {connection.client}: {result}")
-                disconnected_clients.append(connection)
-
-        # Remove clients that failed or disconnected during broadcast
-        for client in set(disconnected_clients): # Use set to avoid duplicates
-             self.disconnect(client)
+                print(f"Error broadcasting to {connection.client}: {result!r}")
+                self.disconnect(connection)
+                dropped.append(connection)
+
+        # Close dropped sockets (a timed-out send may have left a partial frame) so
+        # their clients see the disconnect and reconnect; errors closing are ignored
+        if dropped:
+            await asyncio.gather(
+                *(asyncio.wait_for(connection.close(), BROADCAST_SEND_TIMEOUT) for connection in dropped),
+                return_exceptions=True,
+            )
 
 manager = ConnectionManager()
 
@@ -76,7 +107,8 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         # Loop indefinitely, waiting for messages from the client
         while True:
-            data = await websocket.receive_json()
+            # Decoded with orjson, matching how outgoing messages are encoded
+            data = orjson.loads(await websocket.receive_text())
 
             print(f"Message received from {websocket.client}: {data}")
 
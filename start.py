@@ -1,6 +1,8 @@
-from flask.cli import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
-if not load_dotenv():
+# python-dotenv ships with uvicorn[standard]; importing Flask just to read .env is not needed
+dotenv_path = find_dotenv(usecwd=True)
+if not dotenv_path or not load_dotenv(dotenv_path):
     print("Error loading .env file")
     import sys
     sys.exit(-1)
@@ -43,12 +45,24 @@ async def lifespan(app: FastAPI):
         print(f"Lifespan ERROR: Failed to connect to Redis: {e}")
 
     try:
-        from ai_agent.src.orchestration.coordinator import Coordinator
-        # Initialize the Coordinate class
-        await Coordinator().initialize_system()
+        from server.api.simulation.manager import get_manager
+        # Created here rather than at import, so each worker process builds its own
+        app.state.sim_manager = get_manager()
     except Exception as e:
         traceback.print_exc()
-        print(f"Lifespan ERROR: Failed to initialize Coordinate class: {e}")
+        print(f"Lifespan ERROR: Failed to initialize SimulationManager: {e}")
+
+    from server.routes import AGENT_ENABLED
+    if AGENT_ENABLED:
+        try:
+            from ai_agent.src.orchestration.coordinator import get_coordinator
+            # Initialize the Coordinate class
+            await get_coordinator().initialize_system()
+        except Exception as e:
+            traceback.print_exc()
+            print(f"Lifespan ERROR: Failed to initialize Coordinate class: {e}")
+    else:
+        print("Lifespan: AI agents disabled (ENABLE_AGENT=false).")
 
     try:
         from data.embedding.vector_log import VectorLogEntry
@@ -75,12 +89,19 @@ app = get_app(lifespan=lifespan)
 if __name__ == '__main__':
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "5174"))
-    reload_flag = os.getenv("DEBUG", "True").lower() in ["true", "1", "t"]
+    # The auto-reloader watches the source tree; only run it when DEBUG is set explicitly
+    reload_flag = os.getenv("DEBUG", "False").lower() in ["true", "1", "t"]
     
+    # Simulation state and websocket clients live in each process, so extra workers
+    # only suit deployments that pin a client to one worker; hence the default of 1
+    workers = 1 if reload_flag else int(os.getenv("WORKERS", "1"))
+
     import uvicorn
+    # loop/http "auto" already pick uvloop and httptools when installed (uvicorn[standard])
     uvicorn.run(
         "start:app",
         host=host,
         port=port,
-        reload=reload_flag
+        reload=reload_flag,
+        workers=workers,
     )
\ No newline at end of file
@@ -1,8 +1,19 @@
-from typing import Dict, Any, List, Optional
+from itertools import chain
+from typing import Dict, Any, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
+import functools
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
+from types import MappingProxyType
+
+# fastjsonschema compiles the structure schema to plain Python; without it the
+# structure is checked by walking the topology by hand
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
 
 class NetworkType(Enum):
     CLASSICAL_NETWORK = "CLASSICAL_NETWORK"
@@ -20,41 +31,116 @@ class ConnectionType(Enum):
     QUANTUM_CHANNEL = "QUANTUM_CHANNEL"
     HYBRID_LINK = "HYBRID_LINK"
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     is_valid: bool
     confidence_score: float
     issues: List[str]
     recommendations: List[str]
 
+@dataclass(slots=True, frozen=True)
+class QueryRequirements:
+    """Topology requirements parsed from a user query; immutable, so safe to cache"""
+    network_types: Tuple[NetworkType, ...] = ()
+    node_counts: Mapping[NodeType, int] = field(default_factory=lambda: MappingProxyType({}))
+    connection_types: Tuple[ConnectionType, ...] = ()
+    security_requirements: FrozenSet[str] = frozenset()
+    topology_structure: Optional[str] = None
+    # (from_node, to_node) pairs that must be connected
+    connections: Tuple[Tuple[str, str], ...] = ()
+
+@dataclass
+class TopologyFacts:
+    """Everything the validators need from a topology, gathered in one walk"""
+    network_types: Set[NetworkType] = field(default_factory=set)
+    node_counts: Dict[NodeType, int] = field(default_factory=dict)
+    node_types: Dict[str, NodeType] = field(default_factory=dict)
+    adapter_specs: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    # (network type or None, network name, connection) for every connection, in topology order
+    connections: List[tuple] = field(default_factory=list)
+    # (zone name, zone type) for every zone
+    zones: List[tuple] = field(default_factory=list)
+
+# Shared default for missing lists in a topology; iterated, never mutated
+_EMPTY: Tuple[()] = ()
+
+# Query patterns, compiled once at import
+_QUANTUM_HOST_COUNT_RE = re.compile(r"(\d+)\s*quantum\s*hosts?")
+_NUMBER_RE = re.compile(r"(\d+)")
+_NODE_COUNT_PATTERNS = [
+    (re.compile(r"(\d+)\s*(?:classical\s*)?hosts?"), NodeType.CLIENT),
+    (re.compile(r"(\d+)\s*(?:classical\s*)?routers?"), NodeType.CLASSICAL_ROUTER),
+    (re.compile(r"(\d+)\s*quantum\s*hosts?"), NodeType.QUANTUM_HOST),
+    (re.compile(r"(\d+)\s*quantum\s*adapters?"), NodeType.QUANTUM_ADAPTER)
+]
+_NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9", "ten": "10"
+}
+# Host "type" values (upper-cased) that map to a node type, including the
+# "QuantumHost" spelling
+_NODE_TYPE_BY_NAME = {node_type.value: node_type for node_type in NodeType}
+_NODE_TYPE_BY_NAME["QUANTUMHOST"] = NodeType.QUANTUM_HOST
+# Network "type" values, so network types are compared as enum members
+_NETWORK_TYPE_BY_NAME = {network_type.value: network_type for network_type in NetworkType}
+# Whole words only, so e.g. "someone" or "stone" are left alone
+_NUMBER_WORDS_RE = re.compile(r"\b(" + "|".join(_NUMBER_WORDS) + r")\b")
+# Confidence penalty per issue, by the first phrase the issue contains
+_ISSUE_WEIGHTS = (
+    ("Missing required network type", 0.3),
+    ("Missing required node", 0.2),
+    ("Missing required connection", 0.2),
+    ("Missing quantum network for QKD", 0.3),
+    ("Missing central node", 0.2),
+    ("Insufficient connections", 0.1)
+)
+
 class TopologyValidatorAgent:
     def __init__(self):
+        # Frozensets so a record's keys can be checked with a single subset test
         self.required_fields = {
-            "zone": ["name", "type", "size", "position", "networks"],
-            "network": ["name", "type", "hosts", "connections"],
-            "host": ["name", "type", "address", "location"],
-            "connection": ["from_node", "to_node", "bandwidth", "latency", "length", "loss_per_km", "noise_model"]
+            "zone": frozenset(["name", "type", "size", "position", "networks"]),
+            "network": frozenset(["name", "type", "hosts", "connections"]),
+            "host": frozenset(["name", "type", "address", "location"]),
+            "connection": frozenset(["from_node", "to_node", "bandwidth", "latency", "length", "loss_per_km", "noise_model"])
         }
         
         self.network_type_patterns = {
-            NetworkType.CLASSICAL_NETWORK: r"classical|traditional|standard",
-            NetworkType.QUANTUM_NETWORK: r"quantum|qkd|entanglement",
-            NetworkType.HYBRID_NETWORK: r"hybrid|mixed|both"
+            NetworkType.CLASSICAL_NETWORK: re.compile(r"classical|traditional|standard", re.IGNORECASE),
+            NetworkType.QUANTUM_NETWORK: re.compile(r"quantum|qkd|entanglement", re.IGNORECASE),
+            NetworkType.HYBRID_NETWORK: re.compile(r"hybrid|mixed|both", re.IGNORECASE)
         }
         
         self.node_type_patterns = {
-            NodeType.CLIENT: r"host|client|endpoint|computer",
-            NodeType.CLASSICAL_ROUTER: r"router|switch|gateway",
-            NodeType.QUANTUM_HOST: r"quantum\s*host|quantum\s*node|qkd\s*node",
-            NodeType.QUANTUM_ADAPTER: r"adapter|converter|interface"
+            NodeType.CLIENT: re.compile(r"host|client|endpoint|computer", re.IGNORECASE),
+            NodeType.CLASSICAL_ROUTER: re.compile(r"router|switch|gateway", re.IGNORECASE),
+            NodeType.QUANTUM_HOST: re.compile(r"quantum\s*host|quantum\s*node|qkd\s*node", re.IGNORECASE),
+            NodeType.QUANTUM_ADAPTER: re.compile(r"adapter|converter|interface", re.IGNORECASE)
         }
 
         self.connection_type_patterns = {
-            ConnectionType.CLASSICAL_LINK: r"classical\s+link|classical\s+connection|standard\s+connection",
-            ConnectionType.QUANTUM_CHANNEL: r"quantum\s+channel|quantum\s+link|entanglement\s+channel",
-            ConnectionType.HYBRID_LINK: r"hybrid\s+link|hybrid\s+connection|mixed\s+connection"
+            ConnectionType.CLASSICAL_LINK: re.compile(r"classical\s+link|classical\s+connection|standard\s+connection", re.IGNORECASE),
+            ConnectionType.QUANTUM_CHANNEL: re.compile(r"quantum\s+channel|quantum\s+link|entanglement\s+channel", re.IGNORECASE),
+            ConnectionType.HYBRID_LINK: re.compile(r"hybrid\s+link|hybrid\s+connection|mixed\s+connection", re.IGNORECASE)
         }
 
+        self._schema_check = (
+            fastjsonschema.compile(self._structure_schema()) if FASTJSONSCHEMA_AVAILABLE else None
+        )
+
+    def _structure_schema(self) -> Dict[str, Any]:
+        """JSON schema equivalent of the required-field checks in _validate_structure"""
+        def record(kind: str, **properties) -> Dict[str, Any]:
+            return {"type": "object", "required": sorted(self.required_fields[kind]), "properties": properties}
+
+        network = record(
+            "network",
+            hosts={"type": "array", "items": record("host")},
+            connections={"type": "array", "items": record("connection")}
+        )
+        zone = record("zone", networks={"type": "array", "items": network})
+        return {"type": "object", "required": ["zones"], "properties": {"zones": {"type": "array", "items": zone}}}
+
     def validate_topology(self, query: str, topology_data: Dict[str, Any]) -> ValidationResult:
         """Validate the generated topology against the user query requirements"""
         try:
@@ -71,25 +157,20 @@ class TopologyValidatorAgent:
             issues = []
             recommendations = []
             
-            # Validate network types
-            network_issues, network_recs = self._validate_network_types(topology_data, requirements)
-            issues.extend(network_issues)
-            recommendations.extend(network_recs)
+            # Walk the topology once; the validators below only read these facts
+            facts = self._collect_topology_facts(topology_data)
             
-            # Validate node counts
-            node_issues, node_recs = self._validate_node_counts(topology_data, requirements)
-            issues.extend(node_issues)
-            recommendations.extend(node_recs)
-            
-            # Validate connections
-            conn_issues, conn_recs = self._validate_connections(topology_data, requirements)
-            issues.extend(conn_issues)
-            recommendations.extend(conn_recs)
-            
-            # Validate security requirements
-            sec_issues, sec_recs = self._validate_security(topology_data, requirements)
-            issues.extend(sec_issues)
-            recommendations.extend(sec_recs)
+            # Validate network types, node counts, connections and security requirements;
+            # each validator yields (issue, recommendation or None) pairs
+            for issue, recommendation in chain(
+                self._validate_network_types(facts, requirements),
+                self._validate_node_counts(facts, requirements),
+                self._validate_connections(facts, requirements),
+                self._validate_security(facts, requirements),
+            ):
+                issues.append(issue)
+                if recommendation is not None:
+                    recommendations.append(recommendation)
             
             # Calculate confidence score
             confidence_score = self._calculate_confidence_score(issues)
@@ -110,40 +191,58 @@ class TopologyValidatorAgent:
 
     def _validate_structure(self, topology: Dict[str, Any]) -> bool:
         """Validate the basic structure of the topology"""
-        try:
-            if not isinstance(topology, dict):
+        if self._schema_check is not None:
+            try:
+                self._schema_check(topology)
+                return True
+            except fastjsonschema.JsonSchemaException:
                 return False
-            
-            if "zones" not in topology:
+        
+        if not isinstance(topology, dict):
+            return False
+        
+        # Same rules as the schema: every level is an array of objects with the required keys
+        has_fields = self._records_have_fields
+        required_host = self.required_fields["host"]
+        required_connection = self.required_fields["connection"]
+        
+        zones = topology.get("zones")
+        if not has_fields(zones, self.required_fields["zone"]):
+            return False
+        
+        for zone in zones:
+            networks = zone["networks"]
+            if not has_fields(networks, self.required_fields["network"]):
                 return False
             
-            for zone in topology["zones"]:
-                if not all(field in zone for field in self.required_fields["zone"]):
+            for network in networks:
+                if not has_fields(network["hosts"], required_host):
                     return False
-                
-                for network in zone.get("networks", []):
-                    if not all(field in network for field in self.required_fields["network"]):
-                        return False
-                    
-                    for host in network.get("hosts", []):
-                        if not all(field in host for field in self.required_fields["host"]):
-                            return False
-                    
-                    for conn in network.get("connections", []):
-                        if not all(field in conn for field in self.required_fields["connection"]):
-                            return False
-            
-            return True
-        except Exception:
-            return False
+                if not has_fields(network["connections"], required_connection):
+                    return False
+        
+        return True
+
+    @staticmethod
+    def _records_have_fields(records: Any, required: frozenset) -> bool:
+        """True if records is an array of objects that all have the required keys"""
+        return isinstance(records, (list, tuple)) and all(
+            isinstance(record, dict) and required <= record.keys() for record in records
+        )
 
-    def parse_user_query(self, query: str) -> dict:
+    def parse_user_query(self, query: str) -> QueryRequirements:
         """Parse the user query to extract topology requirements"""
+        return self._parse_user_query_cached(query)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _parse_user_query_cached(query: str) -> QueryRequirements:
+        """parse_user_query's work, cached per query string"""
         requirements = {
             "network_types": [],
             "node_counts": {},
             "connection_types": [],
-            "security_requirements": [],
+            "security_requirements": set(),
             "topology_structure": None
         }
         
@@ -152,61 +251,47 @@ class TopologyValidatorAgent:
         
         # Extract network types
         if "classical network" in query_lower:
-            requirements["network_types"].append("CLASSICAL_NETWORK")
+            requirements["network_types"].append(NetworkType.CLASSICAL_NETWORK)
         if "quantum network" in query_lower:
-            requirements["network_types"].append("QUANTUM_NETWORK")
+            requirements["network_types"].append(NetworkType.QUANTUM_NETWORK)
             # If we detect a quantum network, we should look for quantum hosts
             # Look for explicit number of quantum hosts
-            matches = re.findall(r"(\d+)\s*quantum\s*hosts?", query_lower)
+            matches = _QUANTUM_HOST_COUNT_RE.findall(query_lower)
             if matches:
                 requirements["node_counts"][NodeType.QUANTUM_HOST] = int(matches[0])
             # If no explicit number but quantum network is mentioned with hosts
             elif "quantum" in query_lower and "host" in query_lower:
                 # Try to find any number mentioned
-                number_match = re.findall(r"(\d+)", query_lower)
+                number_match = _NUMBER_RE.findall(query_lower)
                 if number_match:
                     requirements["node_counts"][NodeType.QUANTUM_HOST] = int(number_match[0])
                 
         if "hybrid network" in query_lower or \
            (("classical" in query_lower or "quantum" in query_lower) and "hybrid" in query_lower):
-            requirements["network_types"].append("HYBRID_NETWORK")
+            requirements["network_types"].append(NetworkType.HYBRID_NETWORK)
         
         # Extract connection types
         if "classical link" in query_lower:
-            requirements["connection_types"].append("CLASSICAL_LINK")
+            requirements["connection_types"].append(ConnectionType.CLASSICAL_LINK)
         if "quantum channel" in query_lower:
-            requirements["connection_types"].append("QUANTUM_CHANNEL")
+            requirements["connection_types"].append(ConnectionType.QUANTUM_CHANNEL)
         if "hybrid link" in query_lower:
-            requirements["connection_types"].append("HYBRID_LINK")
-        
-        # Extract node counts using regex
-        number_words = {
-            "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-            "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10
-        }
+            requirements["connection_types"].append(ConnectionType.HYBRID_LINK)
         
-        # Convert number words to digits
-        for word, digit in number_words.items():
-            query_lower = query_lower.replace(word, str(digit))
+        # Convert number words to digits in a single pass
+        query_lower = _NUMBER_WORDS_RE.sub(lambda m: _NUMBER_WORDS[m.group(1)], query_lower)
         
         # Extract node counts
-        node_patterns = [
-            (r"(\d+)\s*(?:classical\s*)?hosts?", NodeType.CLIENT),
-            (r"(\d+)\s*(?:classical\s*)?routers?", NodeType.CLASSICAL_ROUTER),
-            (r"(\d+)\s*quantum\s*hosts?", NodeType.QUANTUM_HOST),
-            (r"(\d+)\s*quantum\s*adapters?", NodeType.QUANTUM_ADAPTER)
-        ]
-        
-        for pattern, node_type in node_patterns:
-            matches = re.findall(pattern, query_lower)
+        for pattern, node_type in _NODE_COUNT_PATTERNS:
+            matches = pattern.findall(query_lower)
             if matches:
                 requirements["node_counts"][node_type] = int(matches[0])
         
         # Extract security requirements
         if "secure" in query_lower:
-            requirements["security_requirements"].append("SECURE")
+            requirements["security_requirements"].add("SECURE")
         if "quantum key distribution" in query_lower or "qkd" in query_lower:
-            requirements["security_requirements"].append("QKD")
+            requirements["security_requirements"].add("QKD")
         
         # Extract topology structure
         if "mesh" in query_lower:
@@ -219,273 +304,216 @@ class TopologyValidatorAgent:
             requirements["topology_structure"] = "BUS"
         
         # Add default connection types based on network types
-        if "CLASSICAL_NETWORK" in requirements["network_types"] and "CLASSICAL_LINK" not in requirements["connection_types"]:
-            requirements["connection_types"].append("CLASSICAL_LINK")
-        if "QUANTUM_NETWORK" in requirements["network_types"] and "QUANTUM_CHANNEL" not in requirements["connection_types"]:
-            requirements["connection_types"].append("QUANTUM_CHANNEL")
-        if "HYBRID_NETWORK" in requirements["network_types"] and "HYBRID_LINK" not in requirements["connection_types"]:
-            requirements["connection_types"].append("HYBRID_LINK")
-        
-        return requirements
+        if NetworkType.CLASSICAL_NETWORK in requirements["network_types"] and ConnectionType.CLASSICAL_LINK not in requirements["connection_types"]:
+            requirements["connection_types"].append(ConnectionType.CLASSICAL_LINK)
+        if NetworkType.QUANTUM_NETWORK in requirements["network_types"] and ConnectionType.QUANTUM_CHANNEL not in requirements["connection_types"]:
+            requirements["connection_types"].append(ConnectionType.QUANTUM_CHANNEL)
+        if NetworkType.HYBRID_NETWORK in requirements["network_types"] and ConnectionType.HYBRID_LINK not in requirements["connection_types"]:
+            requirements["connection_types"].append(ConnectionType.HYBRID_LINK)
+        
+        return QueryRequirements(
+            network_types=tuple(requirements["network_types"]),
+            node_counts=MappingProxyType(requirements["node_counts"]),
+            connection_types=tuple(requirements["connection_types"]),
+            security_requirements=frozenset(requirements["security_requirements"]),
+            topology_structure=requirements["topology_structure"]
+        )
 
-    def _validate_network_types(self, topology: dict, requirements: dict) -> tuple[list[str], list[str]]:
-        issues = []
-        recommendations = []
-        
-        required_types = set(requirements.get("network_types", []))
-        found_types = set()
-        
-        for zone in topology.get("zones", []):
-            for network in zone.get("networks", []):
-                network_type = network.get("type")
-                if network_type:
-                    found_types.add(network_type)
+    def _validate_network_types(self, facts: TopologyFacts, requirements: QueryRequirements) -> Iterator[tuple[str, Optional[str]]]:
+        required_types = set(requirements.network_types)
+        found_types = set(facts.network_types)
         
         # Special handling for hybrid networks
-        if "HYBRID_NETWORK" in required_types:
-            if "CLASSICAL_NETWORK" in found_types and "QUANTUM_NETWORK" in found_types:
-                found_types.add("HYBRID_NETWORK")
+        if NetworkType.HYBRID_NETWORK in required_types:
+            if NetworkType.CLASSICAL_NETWORK in found_types and NetworkType.QUANTUM_NETWORK in found_types:
+                found_types.add(NetworkType.HYBRID_NETWORK)
         
         for req_type in required_types:
             if req_type not in found_types:
-                issues.append(f"Missing required network type: {req_type}")
-                recommendations.append("Add missing network types or modify existing ones")
-        
-        return issues, recommendations
+                yield f"Missing required network type: {req_type.value}", "Add missing network types or modify existing ones"
 
-    def _get_node_type(self, topology: dict, node_name: str) -> NodeType:
-        """Get the type of a node by its name"""
-        for zone in topology.get("zones", []):
-            for network in zone.get("networks", []):
-                for host in network.get("hosts", []):
-                    if host.get("name") == node_name:
-                        node_type = host.get("type", "").upper().replace("QUANTUMHOST", "QUANTUM_HOST")
-                        if node_type == "CLIENT":
-                            return NodeType.CLIENT
-                        elif node_type == "CLASSICAL_ROUTER":
-                            return NodeType.CLASSICAL_ROUTER
-                        elif node_type == "QUANTUM_HOST":
-                            return NodeType.QUANTUM_HOST
-                        elif node_type == "QUANTUM_ADAPTER":
-                            return NodeType.QUANTUM_ADAPTER
-            
-            # Check adapters
-            for adapter in zone.get("adapters", []):
-                if adapter.get("name") == node_name:
-                    return NodeType.QUANTUM_ADAPTER
-        
-        return None
+    def _collect_topology_facts(self, topology: dict) -> TopologyFacts:
+        """Walk zones, networks, hosts, connections and adapters once, gathering what
+        every validator needs.
 
-    def _validate_node_counts(self, topology: dict, requirements: dict) -> tuple[list[str], list[str]]:
-        issues = []
-        recommendations = []
-        
-        required_counts = requirements.get("node_counts", {})
-        found_counts = {
+        Node names resolve to the first node with a known type, in the order a search
+        would visit them (each zone's hosts, then its adapters).
+        """
+        facts = TopologyFacts(node_counts={
             NodeType.CLIENT: 0,
             NodeType.CLASSICAL_ROUTER: 0,
             NodeType.QUANTUM_HOST: 0,
             NodeType.QUANTUM_ADAPTER: 0
-        }
+        })
         
-        # Count nodes in topology
-        for zone in topology.get("zones", []):
-            for network in zone.get("networks", []):
-                for host in network.get("hosts", []):
-                    node_type = host.get("type", "").upper().replace("QUANTUMHOST", "QUANTUM_HOST")
-                    if node_type == "CLIENT":
-                        found_counts[NodeType.CLIENT] += 1
-                    elif node_type == "CLASSICAL_ROUTER":
-                        found_counts[NodeType.CLASSICAL_ROUTER] += 1
-                    elif node_type == "QUANTUM_HOST":
-                        found_counts[NodeType.QUANTUM_HOST] += 1
+        for zone in topology.get("zones", _EMPTY):
+            facts.zones.append((zone.get("name"), zone.get("type")))
             
-            # Count adapters
-            for adapter in zone.get("adapters", []):
-                found_counts[NodeType.QUANTUM_ADAPTER] += 1
+            for network in zone.get("networks", _EMPTY):
+                network_type = _NETWORK_TYPE_BY_NAME.get(network.get("type"))
+                if network_type is not None:
+                    facts.network_types.add(network_type)
+                
+                for host in network.get("hosts", _EMPTY):
+                    node_type = _NODE_TYPE_BY_NAME.get(host.get("type", "").upper())
+                    if node_type is None:
+                        continue
+                    facts.node_types.setdefault(host.get("name"), node_type)
+                    # Adapters are only counted from the zone's adapter list
+                    if node_type != NodeType.QUANTUM_ADAPTER:
+                        facts.node_counts[node_type] += 1
+                
+                for conn in network.get("connections", _EMPTY):
+                    facts.connections.append((network_type, network.get("name"), conn))
+            
+            for adapter in zone.get("adapters", _EMPTY):
+                facts.node_types.setdefault(adapter.get("name"), NodeType.QUANTUM_ADAPTER)
+                facts.node_counts[NodeType.QUANTUM_ADAPTER] += 1
+                facts.adapter_specs[adapter["name"]] = {
+                    "classical_host": adapter["classicalHost"],
+                    "quantum_host": adapter["quantumHost"],
+                    "classical_network": adapter["classicalNetwork"],
+                    "quantum_network": adapter["quantumNetwork"]
+                }
+        
+        return facts
+
+    def _validate_node_counts(self, facts: TopologyFacts, requirements: QueryRequirements) -> Iterator[tuple[str, Optional[str]]]:
+        required_counts = requirements.node_counts
+        found_counts = facts.node_counts
         
         # Compare counts
         for node_type, required_count in required_counts.items():
             found_count = found_counts.get(node_type, 0)
             if found_count < required_count:
-                issues.append(f"Missing {required_count - found_count} {node_type.name} nodes")
-                recommendations.append(f"Add {required_count - found_count} {node_type.name} nodes")
+                yield f"Missing {required_count - found_count} {node_type.name} nodes", f"Add {required_count - found_count} {node_type.name} nodes"
             elif found_count > required_count:
-                issues.append(f"Extra {found_count - required_count} {node_type.name} nodes")
-                recommendations.append(f"Remove {found_count - required_count} {node_type.name} nodes")
-        
-        return issues, recommendations
+                yield f"Extra {found_count - required_count} {node_type.name} nodes", f"Remove {found_count - required_count} {node_type.name} nodes"
 
-    def _validate_connections(self, topology: dict, requirements: dict) -> tuple[list[str], list[str]]:
-        issues = []
-        recommendations = []
-        
-        # Get all connections from the topology
-        all_connections = []
-        for zone in topology.get("zones", []):
-            for network in zone.get("networks", []):
-                for conn in network.get("connections", []):
-                    all_connections.append((conn["from_node"], conn["to_node"]))
-        
+    def _validate_connections(self, facts: TopologyFacts, requirements: QueryRequirements) -> Iterator[tuple[str, Optional[str]]]:
         # Track adapter connections and their specifications
-        adapter_specs = {}  # adapter_name -> {"classical_host": str, "quantum_host": str}
-        adapter_connections = {}  # adapter_name -> {"classical": [], "quantum": []}
+        adapter_specs = facts.adapter_specs  # adapter_name -> {"classical_host": str, "quantum_host": str}
+        # adapter_name -> {"classical": set(), "quantum": set()} of connected nodes; the
+        # counts include repeated links to the same node
+        adapter_connections = {
+            adapter_name: {
+                "classical": set(),
+                "quantum": set(),
+                "classical_count": 0,
+                "quantum_count": 0,
+                "classical_network": spec["classical_network"],
+                "quantum_network": spec["quantum_network"]
+            }
+            for adapter_name, spec in adapter_specs.items()
+        }
         
-        # Initialize adapter tracking from topology specification
-        for zone in topology.get("zones", []):
-            for adapter in zone.get("adapters", []):
-                adapter_name = adapter["name"]
-                adapter_specs[adapter_name] = {
-                    "classical_host": adapter["classicalHost"],
-                    "quantum_host": adapter["quantumHost"],
-                    "classical_network": adapter["classicalNetwork"],
-                    "quantum_network": adapter["quantumNetwork"]
-                }
-                adapter_connections[adapter_name] = {
-                    "classical": [],
-                    "quantum": [],
-                    "classical_network": adapter["classicalNetwork"],
-                    "quantum_network": adapter["quantumNetwork"]
-                }
+        node_types = facts.node_types
         
         # Validate connections based on node types and network context
-        for zone in topology.get("zones", []):
-            for network in zone.get("networks", []):
-                network_type = network.get("type")
-                network_name = network.get("name")
+        for network_type, network_name, conn in facts.connections:
+            from_node = node_types.get(conn["from_node"])
+            to_node = node_types.get(conn["to_node"])
+            
+            if not from_node or not to_node:
+                yield f"Invalid node type for connection between {conn['from_node']} and {conn['to_node']}", None
+                continue
+            
+            # Track and validate adapter connections
+            if from_node == NodeType.QUANTUM_ADAPTER or to_node == NodeType.QUANTUM_ADAPTER:
+                adapter_name = conn["from_node"] if from_node == NodeType.QUANTUM_ADAPTER else conn["to_node"]
+                other_node = conn["to_node"] if from_node == NodeType.QUANTUM_ADAPTER else conn["from_node"]
+                other_node_type = to_node if from_node == NodeType.QUANTUM_ADAPTER else from_node
                 
-                for conn in network.get("connections", []):
-                    from_node = self._get_node_type(topology, conn["from_node"])
-                    to_node = self._get_node_type(topology, conn["to_node"])
-                    
-                    if not from_node or not to_node:
-                        issues.append(f"Invalid node type for connection between {conn['from_node']} and {conn['to_node']}")
-                        continue
-                    
-                    # Track and validate adapter connections
-                    if from_node == NodeType.QUANTUM_ADAPTER or to_node == NodeType.QUANTUM_ADAPTER:
-                        adapter_name = conn["from_node"] if from_node == NodeType.QUANTUM_ADAPTER else conn["to_node"]
-                        other_node = conn["to_node"] if from_node == NodeType.QUANTUM_ADAPTER else conn["from_node"]
-                        other_node_type = to_node if from_node == NodeType.QUANTUM_ADAPTER else from_node
-                        
-                        # Verify adapter exists in topology specification
-                        if adapter_name not in adapter_specs:
-                            issues.append(f"Adapter {adapter_name} not found in topology specification")
-                            recommendations.append(f"Add adapter {adapter_name} to topology specification")
-                            continue
-                        
-                        # Track the connection based on node type
-                        if other_node_type in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER]:
-                            adapter_connections[adapter_name]["classical"].append(other_node)
-                            # Verify connection is in the correct network
-                            if network_name != adapter_specs[adapter_name]["classical_network"]:
-                                issues.append(f"Adapter {adapter_name} connected to classical node in wrong network")
-                                recommendations.append(f"Move connection to {adapter_specs[adapter_name]['classical_network']}")
-                        elif other_node_type == NodeType.QUANTUM_HOST:
-                            adapter_connections[adapter_name]["quantum"].append(other_node)
-                            # Verify connection is in the correct network
-                            if network_name != adapter_specs[adapter_name]["quantum_network"]:
-                                issues.append(f"Adapter {adapter_name} connected to quantum node in wrong network")
-                                recommendations.append(f"Move connection to {adapter_specs[adapter_name]['quantum_network']}")
-                        else:
-                            issues.append(f"Invalid connection type for adapter {adapter_name}")
-                            recommendations.append("Adapters should only connect to classical or quantum nodes")
-                    
-                    # Validate connections based on network type and node types
-                    if network_type == "CLASSICAL_NETWORK":
-                        # Classical network should only have classical connections
-                        if from_node == NodeType.QUANTUM_HOST or to_node == NodeType.QUANTUM_HOST:
-                            issues.append(f"Invalid quantum node in classical network: {conn['from_node']} to {conn['to_node']}")
-                            recommendations.append("Move quantum nodes to quantum network")
-                        elif from_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER] and \
-                             to_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER]:
-                            # Check if CLASSICAL_LINK is required
-                            if "CLASSICAL_LINK" in requirements.get("connection_types", []):
-                                if conn.get("noise_model") != "default":
-                                    issues.append(f"Invalid noise model for classical link between {conn['from_node']} and {conn['to_node']}")
-                                    recommendations.append("Use default noise model for classical links")
-                    
-                    elif network_type == "QUANTUM_NETWORK":
-                        # Quantum network should only have quantum connections
-                        if from_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER] or \
-                           to_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER]:
-                            issues.append(f"Invalid classical node in quantum network: {conn['from_node']} to {conn['to_node']}")
-                            recommendations.append("Move classical nodes to classical network")
-                        elif from_node == NodeType.QUANTUM_HOST and to_node == NodeType.QUANTUM_HOST:
-                            # Check if QUANTUM_CHANNEL is required
-                            if "QUANTUM_CHANNEL" in requirements.get("connection_types", []):
-                                if conn.get("noise_model") != "quantum":
-                                    issues.append(f"Invalid noise model for quantum channel between {conn['from_node']} and {conn['to_node']}")
-                                    recommendations.append("Use quantum noise model for quantum channels")
-        
+                # Verify adapter exists in topology specification
+                if adapter_name not in adapter_specs:
+                    yield f"Adapter {adapter_name} not found in topology specification", f"Add adapter {adapter_name} to topology specification"
+                    continue
+                
+                # Track the connection based on node type
+                if other_node_type in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER]:
+                    adapter_connections[adapter_name]["classical"].add(other_node)
+                    adapter_connections[adapter_name]["classical_count"] += 1
+                    # Verify connection is in the correct network
+                    if network_name != adapter_specs[adapter_name]["classical_network"]:
+                        yield f"Adapter {adapter_name} connected to classical node in wrong network", f"Move connection to {adapter_specs[adapter_name]['classical_network']}"
+                elif other_node_type == NodeType.QUANTUM_HOST:
+                    adapter_connections[adapter_name]["quantum"].add(other_node)
+                    adapter_connections[adapter_name]["quantum_count"] += 1
+                    # Verify connection is in the correct network
+                    if network_name != adapter_specs[adapter_name]["quantum_network"]:
+                        yield f"Adapter {adapter_name} connected to quantum node in wrong network", f"Move connection to {adapter_specs[adapter_name]['quantum_network']}"
+                else:
+                    yield f"Invalid connection type for adapter {adapter_name}", "Adapters should only connect to classical or quantum nodes"
+            
+            # Validate connections based on network type and node types
+            if network_type is NetworkType.CLASSICAL_NETWORK:
+                # Classical network should only have classical connections
+                if from_node == NodeType.QUANTUM_HOST or to_node == NodeType.QUANTUM_HOST:
+                    yield f"Invalid quantum node in classical network: {conn['from_node']} to {conn['to_node']}", "Move quantum nodes to quantum network"
+                elif from_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER] and \
+                     to_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER]:
+                    # Check if CLASSICAL_LINK is required
+                    if ConnectionType.CLASSICAL_LINK in requirements.connection_types:
+                        if conn.get("noise_model") != "default":
+                            yield f"Invalid noise model for classical link between {conn['from_node']} and {conn['to_node']}", "Use default noise model for classical links"
+            
+            elif network_type is NetworkType.QUANTUM_NETWORK:
+                # Quantum network should only have quantum connections
+                if from_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER] or \
+                   to_node in [NodeType.CLIENT, NodeType.CLASSICAL_ROUTER]:
+                    yield f"Invalid classical node in quantum network: {conn['from_node']} to {conn['to_node']}", "Move classical nodes to classical network"
+                elif from_node == NodeType.QUANTUM_HOST and to_node == NodeType.QUANTUM_HOST:
+                    # Check if QUANTUM_CHANNEL is required
+                    if ConnectionType.QUANTUM_CHANNEL in requirements.connection_types:
+                        if conn.get("noise_model") != "quantum":
+                            yield f"Invalid noise model for quantum channel between {conn['from_node']} and {conn['to_node']}", "Use quantum noise model for quantum channels"
+
         # Validate adapter connections are complete and match specifications
         for adapter_name, connections in adapter_connections.items():
             if adapter_name not in adapter_specs:
                 continue
                 
             # Check classical connection
-            if not any(host == adapter_specs[adapter_name]["classical_host"] for host in connections["classical"]):
-                issues.append(f"Adapter {adapter_name} missing connection to specified classical host {adapter_specs[adapter_name]['classical_host']}")
-                recommendations.append(f"Add connection between {adapter_name} and {adapter_specs[adapter_name]['classical_host']}")
+            if adapter_specs[adapter_name]["classical_host"] not in connections["classical"]:
+                yield f"Adapter {adapter_name} missing connection to specified classical host {adapter_specs[adapter_name]['classical_host']}", f"Add connection between {adapter_name} and {adapter_specs[adapter_name]['classical_host']}"
             
             # Check quantum connection
-            if not any(host == adapter_specs[adapter_name]["quantum_host"] for host in connections["quantum"]):
-                issues.append(f"Adapter {adapter_name} missing connection to specified quantum host {adapter_specs[adapter_name]['quantum_host']}")
-                recommendations.append(f"Add connection between {adapter_name} and {adapter_specs[adapter_name]['quantum_host']}")
+            if adapter_specs[adapter_name]["quantum_host"] not in connections["quantum"]:
+                yield f"Adapter {adapter_name} missing connection to specified quantum host {adapter_specs[adapter_name]['quantum_host']}", f"Add connection between {adapter_name} and {adapter_specs[adapter_name]['quantum_host']}"
             
             # Check for extra connections
-            if len(connections["classical"]) > 1:
-                issues.append(f"Adapter {adapter_name} has too many classical connections")
-                recommendations.append("Adapters should only connect to one classical host")
+            if connections["classical_count"] > 1:
+                yield f"Adapter {adapter_name} has too many classical connections", "Adapters should only connect to one classical host"
             
-            if len(connections["quantum"]) > 1:
-                issues.append(f"Adapter {adapter_name} has too many quantum connections")
-                recommendations.append("Adapters should only connect to one quantum host")
+            if connections["quantum_count"] > 1:
+                yield f"Adapter {adapter_name} has too many quantum connections", "Adapters should only connect to one quantum host"
         
         # Check for required connections
-        if "connections" in requirements:
-            for req_conn in requirements["connections"]:
+        if requirements.connections:
+            # Unordered endpoint pairs of every connection in the topology
+            all_connections = {
+                frozenset((conn["from_node"], conn["to_node"])) for _, _, conn in facts.connections
+            }
+            for req_conn in requirements.connections:
                 from_node, to_node = req_conn
-                found = False
-                for conn in all_connections:
-                    if (conn[0] == from_node and conn[1] == to_node) or \
-                       (conn[0] == to_node and conn[1] == from_node):
-                        found = True
-                        break
-                
-                if not found:
-                    issues.append(f"Missing required connection between {from_node} and {to_node}")
-                    recommendations.append(f"Add connection between {from_node} and {to_node}")
-        
-        return issues, recommendations
+                if frozenset((from_node, to_node)) not in all_connections:
+                    yield f"Missing required connection between {from_node} and {to_node}", f"Add connection between {from_node} and {to_node}"
 
-    def _validate_security(self, topology: dict, requirements: dict) -> tuple[list[str], list[str]]:
-        issues = []
-        recommendations = []
-        
-        security_reqs = requirements.get("security_requirements", [])
+    def _validate_security(self, facts: TopologyFacts, requirements: QueryRequirements) -> Iterator[tuple[str, Optional[str]]]:
+        security_reqs = requirements.security_requirements
         
         # Check for QKD requirement
         if "QKD" in security_reqs:
-            has_qkd = False
-            for zone in topology.get("zones", []):
-                for network in zone.get("networks", []):
-                    if network.get("type") == "QUANTUM_NETWORK":
-                        has_qkd = True
-                        break
+            has_qkd = NetworkType.QUANTUM_NETWORK in facts.network_types
             
             if not has_qkd:
-                issues.append("Missing quantum network for QKD")
-                recommendations.append("Add quantum network for QKD support")
+                yield "Missing quantum network for QKD", "Add quantum network for QKD support"
         
         # Check for secure zones
         if "SECURE" in security_reqs:
-            for zone in topology.get("zones", []):
-                if zone.get("type") != "SECURE":
-                    issues.append(f"Zone {zone.get('name')} is not marked as secure")
-                    recommendations.append(f"Mark zone {zone.get('name')} as secure")
-        
-        return issues, recommendations
+            for zone_name, zone_type in facts.zones:
+                if zone_type != "SECURE":
+                    yield f"Zone {zone_name} is not marked as secure", f"Mark zone {zone_name} as secure"
 
     def _calculate_confidence_score(self, issues: List[str]) -> float:
         """Calculate a confidence score based on the number and severity of issues"""
@@ -493,18 +521,9 @@ class TopologyValidatorAgent:
             return 1.0
         
         # Weight different types of issues
-        weights = {
-            "Missing required network type": 0.3,
-            "Missing required node": 0.2,
-            "Missing required connection": 0.2,
-            "Missing quantum network for QKD": 0.3,
-            "Missing central node": 0.2,
-            "Insufficient connections": 0.1
-        }
-        
         total_weight = 0.0
         for issue in issues:
-            for key, weight in weights.items():
+            for key, weight in _ISSUE_WEIGHTS:
                 if key in issue:
                     total_weight += weight
                     break
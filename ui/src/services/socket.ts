@@ -134,28 +134,11 @@ export class WebSocketClient {
                         // Assuming server sends JSON strings
                         const messageData = JSON.parse(event.data);
 
-                        // Check the expected format { event: string, data: any }
-                        if (messageData && typeof messageData.event === 'string' && messageData.hasOwnProperty('data')) {
-                            const eventName = messageData.event;
-                            const payload = messageData.data;
-
-                            // Find handlers for this specific event name
-                            const handlers = this.messageHandlers.get(eventName);
-                            if (handlers && handlers.length > 0) {
-                                // console.log(`Dispatching event "${eventName}" to ${handlers.length} handlers.`);
-                                handlers.forEach(handler => {
-                                    try {
-                                        handler(payload);
-                                    } catch (handlerError) {
-                                        console.error(`Error in message handler for event "${eventName}":`, handlerError);
-                                    }
-                                });
-                            } else {
-                                // console.warn(`No message handlers registered for event: ${eventName}`);
-                            }
+                        // The server coalesces bursts of events into { batch: [{event, data}, ...] }
+                        if (messageData && Array.isArray(messageData.batch)) {
+                            messageData.batch.forEach((item: any) => this.dispatchMessage(item));
                         } else {
-                            console.warn('Received message does not match expected format {event, data}:', messageData);
-                            // Optionally handle messages not matching the format differently
+                            this.dispatchMessage(messageData);
                         }
                     } catch (e) {
                         console.error('Failed to parse incoming WebSocket message or invalid format:', event.data, e);
@@ -173,6 +156,37 @@ export class WebSocketClient {
         });
     }
 
+    /**
+     * Route a single { event: string, data: any } message to its registered handlers.
+     *
+     * @param messageData Parsed message from the server
+     */
+    private dispatchMessage(messageData: any): void {
+        // Check the expected format { event: string, data: any }
+        if (messageData && typeof messageData.event === 'string' && messageData.hasOwnProperty('data')) {
+            const eventName = messageData.event;
+            const payload = messageData.data;
+
+            // Find handlers for this specific event name
+            const handlers = this.messageHandlers.get(eventName);
+            if (handlers && handlers.length > 0) {
+                // console.log(`Dispatching event "${eventName}" to ${handlers.length} handlers.`);
+                handlers.forEach(handler => {
+                    try {
+                        handler(payload);
+                    } catch (handlerError) {
+                        console.error(`Error in message handler for event "${eventName}":`, handlerError);
+                    }
+                });
+            } else {
+                // console.warn(`No message handlers registered for event: ${eventName}`);
+            }
+        } else {
+            console.warn('Received message does not match expected format {event, data}:', messageData);
+            // Optionally handle messages not matching the format differently
+        }
+    }
+
     /**
      * Reconnect to the server using the same URL.
      */